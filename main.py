@@ -5,7 +5,14 @@ This module demonstrates how to start the agents with Pub/Sub messaging.
 
 import asyncio
 import logging
-from aegis_agents.shared.messaging import PubSubSubscriber, MessagingSettings, Topics
+from aegis_agents.shared.messaging import (
+    FairShareScheduler,
+    PubSubPublisher,
+    PubSubSubscriber,
+    Topics,
+    get_messaging_settings,
+)
+from aegis_agents.test_planner.handler import failure_reporter
 
 # Configure logging
 logging.basicConfig(
@@ -37,17 +44,28 @@ async def main() -> None:
     logger.info("Starting Aegis Test Agents")
 
     # Create subscriber with environment configuration
-    settings = MessagingSettings()
-    subscriber = PubSubSubscriber(settings)
+    settings = get_messaging_settings()
+    publisher = PubSubPublisher(settings)
+    # Failed messages are retried with backoff, then acked and reported as failed events
+    subscriber = PubSubSubscriber(settings, on_failure=failure_reporter(publisher))
+    # Fair-share admission across test projects so one tenant cannot starve the others.
+    # A tenant's backlog is capped well below the flow-control window; messages past
+    # the cap are nacked at once and come back after the subscription's minimum_backoff.
+    scheduler = FairShareScheduler(
+        max_concurrency=16,
+        tenant_concurrency=4,
+        tenant_max_pending=max(1, settings.pubsub_max_outstanding_messages // 10),
+    )
 
     try:
         # Connect to messaging backend
+        await publisher.connect()
         await subscriber.connect()
 
         # Subscribe to test generation requested topic
         await subscriber.subscribe(
             Topics.TEST_GENERATION_REQUESTED,
-            handle_test_generation_request,
+            scheduler.wrap(handle_test_generation_request),
         )
 
         # Start consuming messages
@@ -58,6 +76,7 @@ async def main() -> None:
         logger.info("Shutting down...")
     finally:
         await subscriber.disconnect()
+        await publisher.disconnect()
 
 
 if __name__ == "__main__":
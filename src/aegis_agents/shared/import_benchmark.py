@@ -0,0 +1,103 @@
+"""Import-time benchmark guarding agent cold start.
+
+Each target module is imported in a fresh interpreter several times; the
+fastest run is compared against a time budget and the set of loaded modules
+is checked for heavy SDKs that must only be imported lazily.
+
+Usage:
+    python -m aegis_agents.shared.import_benchmark
+    python -m aegis_agents.shared.import_benchmark --budget-ms 300 --runs 7
+
+Exits with a non-zero status when a budget is exceeded or a forbidden module
+is imported eagerly, so it can run as a CI step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Modules that must stay cheap to import, with the heavy packages they must not load.
+DEFAULT_TARGETS: dict[str, tuple[str, ...]] = {
+    "aegis_agents.shared.messaging": (
+        "google.cloud.pubsub_v1",
+        "google.protobuf",
+        "grpc",
+        "google.auth",
+    ),
+    "aegis_agents.shared.messaging.topics": ("google", "grpc"),
+    "aegis_agents.shared.contracts": ("google", "grpc"),
+}
+DEFAULT_BUDGET_MS = 500.0
+DEFAULT_RUNS = 5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"elapsed_ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+@dataclass(frozen=True)
+class ImportMeasurement:
+    """Result of benchmarking a single module import."""
+
+    module: str
+    best_ms: float
+    forbidden_loaded: tuple[str, ...]
+
+
+def measure_import(
+    module: str,
+    forbidden: tuple[str, ...],
+    runs: int = DEFAULT_RUNS,
+) -> ImportMeasurement:
+    """Import a module in fresh interpreters and keep the fastest run."""
+    best_ms = float("inf")
+    loaded: set[str] = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        best_ms = min(best_ms, probe["elapsed_ms"])
+        loaded.update(probe["modules"])
+
+    forbidden_loaded = tuple(
+        name
+        for name in forbidden
+        if any(loaded_name == name or loaded_name.startswith(f"{name}.") for loaded_name in loaded)
+    )
+    return ImportMeasurement(module=module, best_ms=best_ms, forbidden_loaded=forbidden_loaded)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and return the process exit status."""
+    parser = argparse.ArgumentParser(description="Guard import time of Aegis agent modules.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, forbidden in DEFAULT_TARGETS.items():
+        result = measure_import(module, forbidden, args.runs)
+        over_budget = result.best_ms > args.budget_ms
+        failed = failed or over_budget or bool(result.forbidden_loaded)
+        status = "FAIL" if over_budget or result.forbidden_loaded else "OK"
+        line = f"{status:4} {module}: {result.best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)"
+        if result.forbidden_loaded:
+            line += f" eagerly imports {', '.join(result.forbidden_loaded)}"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,18 +21,59 @@ Usage:
     await subscriber.start_consuming()
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .config import MessagingSettings, get_messaging_settings
 from .interfaces import MessagePublisher, MessageSubscriber
-from .pubsub import PubSubPublisher, PubSubSubscriber
+from .replay import MessageRecorder, MessageReplayer, mask_sensitive_fields, read_recording
+from .retry import DeferredDelivery, NonRetryableError, RetryingDelivery, RetryPolicy
+from .scheduling import FairShareScheduler, SchedulerOverloadedError
 from .topics import MessagingDestination, Topics
 
+if TYPE_CHECKING:
+    from .pubsub import PubSubPublisher, PubSubSubscriber
+
+# Backends that pull heavy SDKs (grpc, protobuf, google-auth) are imported
+# on first attribute access so importing topics or contracts stays cheap.
+_LAZY_ATTRIBUTES = {
+    "PubSubPublisher": ".pubsub",
+    "PubSubSubscriber": ".pubsub",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
+
+
 __all__ = [
+    "DeferredDelivery",
+    "FairShareScheduler",
     "MessagingDestination",
     "MessagingSettings",
     "MessagePublisher",
+    "MessageRecorder",
+    "MessageReplayer",
     "MessageSubscriber",
+    "NonRetryableError",
     "PubSubPublisher",
     "PubSubSubscriber",
+    "RetryPolicy",
+    "RetryingDelivery",
+    "SchedulerOverloadedError",
     "Topics",
     "get_messaging_settings",
+    "mask_sensitive_fields",
+    "read_recording",
 ]
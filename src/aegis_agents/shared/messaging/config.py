@@ -1,6 +1,7 @@
 """Messaging configuration settings."""
 
 import importlib
+from functools import lru_cache
 from typing import Any
 from pydantic import Field
 
@@ -25,8 +26,33 @@ class MessagingSettings(BaseSettings):
         default=None,
         description="Pub/Sub emulator host (for local development)",
     )
+    pubsub_max_outstanding_messages: int = Field(
+        default=1000,
+        description="Flow control: max leased (unacked) messages per subscription",
+    )
+    pubsub_max_outstanding_bytes: int = Field(
+        default=100 * 1024 * 1024,
+        description="Flow control: max leased (unacked) bytes per subscription",
+    )
+    pubsub_max_delivery_attempts: int = Field(
+        default=5,
+        description="Deliveries of a failing message before it is acked and reported",
+    )
+    pubsub_retry_initial_backoff_seconds: float = Field(
+        default=10.0,
+        description="Delay before redelivering a failed message (doubles per attempt)",
+    )
+    pubsub_retry_max_backoff_seconds: float = Field(
+        default=60.0,
+        description="Upper bound for the redelivery backoff",
+    )
 
 
+@lru_cache(maxsize=1)
 def get_messaging_settings() -> MessagingSettings:
-    """Get messaging settings singleton."""
+    """Get messaging settings singleton.
+
+    Environment variables and ``.env`` are read once; call
+    ``get_messaging_settings.cache_clear()`` to reload them.
+    """
     return MessagingSettings()
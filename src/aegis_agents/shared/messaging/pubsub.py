@@ -7,11 +7,13 @@ import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any
 
+from google.api_core.exceptions import AlreadyExists, NotFound
 from google.cloud import pubsub_v1
 from google.cloud.pubsub_v1.subscriber.message import Message
 
 from .config import MessagingSettings
 from .interfaces import MessagePublisher, MessageSubscriber
+from .retry import FailureHandler, RetryingDelivery, RetryPolicy
 from .topics import MessagingDestination
 
 logger = logging.getLogger(__name__)
@@ -81,13 +83,28 @@ class PubSubPublisher(MessagePublisher):
 class PubSubSubscriber(MessageSubscriber):
     """Google Cloud Pub/Sub subscriber implementation."""
 
-    def __init__(self, settings: MessagingSettings) -> None:
+    def __init__(
+        self,
+        settings: MessagingSettings,
+        on_failure: FailureHandler | None = None,
+    ) -> None:
         """Initialize Pub/Sub subscriber.
 
         Args:
             settings: Messaging configuration settings.
+            on_failure: Called with (message, correlation_id, error) when a
+                message is given up on after its retries; use it to publish
+                the agent's error event.
         """
         self._settings = settings
+        self._delivery = RetryingDelivery(
+            RetryPolicy(
+                max_attempts=settings.pubsub_max_delivery_attempts,
+                initial_backoff=settings.pubsub_retry_initial_backoff_seconds,
+                max_backoff=settings.pubsub_retry_max_backoff_seconds,
+            ),
+            on_failure=on_failure,
+        )
         self._subscriber: pubsub_v1.SubscriberClient | None = None
         self._streaming_pulls: list[Any] = []
         self._subscriptions: list[tuple[MessagingDestination, Callable]] = []
@@ -124,6 +141,39 @@ class PubSubSubscriber(MessageSubscriber):
             f"/subscriptions/{destination.subscription}"
         )
 
+    async def ensure_subscription(self, destination: MessagingDestination) -> None:
+        """Create the destination's subscription on its topic if it does not exist.
+
+        Raises:
+            ValueError: If the subscription exists but is attached to another topic.
+        """
+        if not self._subscriber:
+            raise RuntimeError("Subscriber not connected")
+
+        subscription_path = self._get_subscription_path(destination)
+        topic_path = f"projects/{self._settings.pubsub_project_id}/topics/{destination.topic}"
+        try:
+            subscription = self._subscriber.get_subscription(
+                request={"subscription": subscription_path}
+            )
+        except NotFound:
+            try:
+                self._subscriber.create_subscription(
+                    request={"name": subscription_path, "topic": topic_path}
+                )
+            except AlreadyExists:
+                return
+            logger.info(
+                "Created Pub/Sub subscription",
+                extra={"subscription": destination.subscription, "topic": destination.topic},
+            )
+            return
+        if subscription.topic != topic_path:
+            raise ValueError(
+                f"Subscription {destination.subscription} is attached to {subscription.topic}, "
+                f"not {topic_path}"
+            )
+
     async def subscribe(
         self,
         destination: MessagingDestination,
@@ -141,11 +191,18 @@ class PubSubSubscriber(MessageSubscriber):
         if not self._subscriber:
             raise RuntimeError("Subscriber not connected")
 
+        loop = asyncio.get_running_loop()
+        flow_control = pubsub_v1.types.FlowControl(
+            max_messages=self._settings.pubsub_max_outstanding_messages,
+            max_bytes=self._settings.pubsub_max_outstanding_bytes,
+        )
         for destination, handler in self._subscriptions:
             subscription_path = self._get_subscription_path(destination)
-            callback = self._create_message_processor(handler)
+            callback = self._create_message_processor(handler, loop)
 
-            streaming_pull = self._subscriber.subscribe(subscription_path, callback)
+            streaming_pull = self._subscriber.subscribe(
+                subscription_path, callback, flow_control=flow_control
+            )
             self._streaming_pulls.append(streaming_pull)
 
             logger.info(
@@ -173,8 +230,17 @@ class PubSubSubscriber(MessageSubscriber):
     def _create_message_processor(
         self,
         handler: Callable[[dict[str, Any], str | None], Awaitable[None]],
+        loop: asyncio.AbstractEventLoop,
     ) -> Callable[[Message], None]:
-        """Create a message processor wrapper for the handler."""
+        """Create a message processor wrapper for the handler.
+
+        The Pub/Sub client invokes callbacks on its own thread pool, so the
+        async handler is scheduled on the consuming event loop without blocking
+        the callback thread. The message stays leased (unacked, counted by flow
+        control) until the handler finishes and is then settled by
+        ``RetryingDelivery``: acked on success, nacked after a backoff on
+        failure, and acked and reported once its attempts are exhausted.
+        """
         def process_message(message: Message) -> None:
             correlation_id = message.attributes.get("correlation_id")
             raw_data = message.data.decode("utf-8") if message.data else ""
@@ -199,7 +265,9 @@ class PubSubSubscriber(MessageSubscriber):
                     f"Message parsed successfully {body}"
                 )
 
-                message.ack()
+                asyncio.run_coroutine_threadsafe(
+                    self._delivery.deliver(message, handler, body, correlation_id), loop
+                )
 
             except json.JSONDecodeError as e:
                 logger.error(
@@ -0,0 +1,424 @@
+"""Record and replay message traffic.
+
+The recorder wraps subscriber handlers and appends every received message,
+its ``correlation_id`` and its arrival offset to a gzip-compressed JSONL
+file. The replayer publishes a recording through any ``MessagePublisher``
+at real speed, N times faster or as fast as possible.
+
+Each recorder run is a session: offsets are measured from the session's
+first message and every entry carries the session id, so appending to an
+existing file starts a new timing base instead of restarting offsets
+mid-file. The recording is flushed periodically, and a file left truncated
+by a killed process is read up to its last complete entry (and repaired
+before a new session is appended to it).
+
+Usage:
+    recorder = MessageRecorder("traffic.jsonl.gz")
+    await subscriber.subscribe(
+        Topics.TEST_GENERATION_REQUESTED,
+        recorder.tap(Topics.TEST_GENERATION_REQUESTED, handler),
+    )
+
+    replayer = MessageReplayer(publisher, speed=10.0)
+    await replayer.replay("traffic.jsonl.gz")
+
+Command line (uses ``MessagingSettings`` from the environment). The CLI
+records from its own subscription on each topic (``<subscription>-recorder``
+by default, created if missing), never from the one the agents consume, so
+recording does not take messages away from them:
+    python -m aegis_agents.shared.messaging.replay record traffic.jsonl.gz
+    python -m aegis_agents.shared.messaging.replay replay traffic.jsonl.gz --speed 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+import zlib
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .config import get_messaging_settings
+from .interfaces import MessagePublisher
+from .topics import MessagingDestination, Topics
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any], str | None], Awaitable[None]]
+
+DEFAULT_SENSITIVE_FIELDS: frozenset[str] = frozenset(
+    {
+        "authorization",
+        "cpf",
+        "email",
+        "password",
+        "secret",
+        "token",
+        "access_token",
+        "refresh_token",
+        "api_key",
+    }
+)
+
+
+def mask_sensitive_fields(value: Any, fields: Iterable[str] = DEFAULT_SENSITIVE_FIELDS) -> Any:
+    """Recursively mask values of sensitive keys.
+
+    Masked values keep a short stable hash so distinct values stay distinct
+    in replayed traffic. Already-masked values are left untouched.
+    """
+    sensitive = {name.lower() for name in fields}
+
+    def mask(node: Any) -> Any:
+        if isinstance(node, dict):
+            return {
+                key: _mask_value(item) if key.lower() in sensitive else mask(item)
+                for key, item in node.items()
+            }
+        if isinstance(node, list):
+            return [mask(item) for item in node]
+        return node
+
+    return mask(value)
+
+
+def _mask_value(value: Any) -> Any:
+    if value is None or (isinstance(value, str) and value.startswith("masked:")):
+        return value
+    digest = hashlib.sha256(json.dumps(value, default=str).encode("utf-8")).hexdigest()
+    return f"masked:{digest[:12]}"
+
+
+def _open_recording(path: Path, mode: str) -> Any:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def _repair_recording(path: Path) -> None:
+    """Drop the truncated tail of a recording so a new session can be appended."""
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    if path.suffix != ".gz":
+        with path.open("rb+") as recording:
+            recording.seek(-1, os.SEEK_END)
+            if recording.read(1) != b"\n":
+                recording.write(b"\n")
+        return
+
+    repaired = path.with_name(f"{path.name}.repair")
+    truncated = False
+    with (
+        gzip.open(path, "rt", encoding="utf-8") as source,
+        gzip.open(repaired, "wt", encoding="utf-8") as target,
+    ):
+        try:
+            for line in source:
+                if line.endswith("\n"):
+                    target.write(line)
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            truncated = True
+    if truncated:
+        os.replace(repaired, path)
+        logger.warning("Repaired truncated message recording", extra={"path": str(path)})
+    else:
+        repaired.unlink()
+
+
+def _destinations_by_name() -> dict[str, MessagingDestination]:
+    return {
+        value.name: value
+        for value in vars(Topics).values()
+        if isinstance(value, MessagingDestination)
+    }
+
+
+class MessageRecorder:
+    """Appends received messages to a compressed JSONL recording."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        mask: bool = True,
+        sensitive_fields: Iterable[str] = DEFAULT_SENSITIVE_FIELDS,
+        flush_every: int = 100,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Open a recording for writing, starting a new session.
+
+        Args:
+            path: Output file; gzip-compressed unless it does not end in ``.gz``.
+            mask: Whether to mask sensitive fields before writing.
+            sensitive_fields: Keys whose values are masked.
+            flush_every: Flush after this many records.
+            flush_interval: Flush when this many seconds passed since the last flush.
+        """
+        self._path = Path(path)
+        self._mask = mask
+        self._sensitive_fields = frozenset(sensitive_fields)
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        _repair_recording(self._path)
+        self._file = _open_recording(self._path, "at")
+        self.session = uuid.uuid4().hex
+        self._first_at: float | None = None
+        self._last_flush = time.monotonic()
+        self._unflushed = 0
+        self.recorded = 0
+
+    def record(
+        self,
+        destination: MessagingDestination,
+        message: dict[str, Any],
+        correlation_id: str | None,
+    ) -> None:
+        """Append a single message to the recording."""
+        payload = mask_sensitive_fields(message, self._sensitive_fields) if self._mask else message
+        now = time.monotonic()
+        if self._first_at is None:
+            self._first_at = now
+        entry = {
+            "session": self.session,
+            "offset": round(now - self._first_at, 6),
+            "destination": destination.name,
+            "topic": destination.topic,
+            "subscription": destination.subscription,
+            "attributes": {"correlation_id": correlation_id} if correlation_id else {},
+            "message": payload,
+        }
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        self.recorded += 1
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every or now - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Make everything recorded so far readable even if the process dies."""
+        self._file.flush()
+        self._last_flush = time.monotonic()
+        self._unflushed = 0
+
+    def tap(self, destination: MessagingDestination, handler: Handler | None = None) -> Handler:
+        """Wrap a subscriber handler so every message is recorded first."""
+
+        async def tapped(message: dict[str, Any], correlation_id: str | None) -> None:
+            self.record(destination, message, correlation_id)
+            if handler is not None:
+                await handler(message, correlation_id)
+
+        return tapped
+
+    def close(self) -> None:
+        """Flush and close the recording."""
+        self._file.close()
+        logger.info(
+            "Closed message recording",
+            extra={"path": str(self._path), "recorded": self.recorded},
+        )
+
+
+def read_recording(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Iterate over the entries of a recording.
+
+    A recording truncated by a killed recorder yields every complete entry
+    and then stops; malformed lines are skipped with a warning.
+    """
+    path = Path(path)
+    with _open_recording(path, "rt") as recording:
+        lines = iter(recording)
+        while True:
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+            except (EOFError, zlib.error, gzip.BadGzipFile):
+                logger.warning("Message recording is truncated", extra={"path": str(path)})
+                return
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping malformed recording entry", extra={"path": str(path)})
+
+
+_NO_SESSION = object()
+
+
+class MessageReplayer:
+    """Publishes a recording preserving (or scaling) its original timing."""
+
+    def __init__(
+        self,
+        publisher: MessagePublisher,
+        speed: float | None = 1.0,
+        sensitive_fields: Iterable[str] = DEFAULT_SENSITIVE_FIELDS,
+        destination_override: MessagingDestination | None = None,
+    ) -> None:
+        """Initialize the replayer.
+
+        Args:
+            publisher: Connected publisher used to send messages.
+            speed: Time scale (1.0 = real time, 10.0 = ten times faster);
+                ``None`` or ``0`` replays as fast as possible.
+            sensitive_fields: Keys masked before publishing.
+            destination_override: Publish everything to this destination instead
+                of the recorded one.
+        """
+        if speed is not None and speed < 0:
+            raise ValueError("speed must be positive, 0 or None")
+        self._publisher = publisher
+        self._speed = speed or None
+        self._sensitive_fields = frozenset(sensitive_fields)
+        self._destination_override = destination_override
+
+    async def replay(self, path: str | Path) -> int:
+        """Replay a recording.
+
+        Timing restarts at each recorded session; the gap between sessions
+        is not preserved.
+
+        Returns:
+            Number of published messages.
+        """
+        known = _destinations_by_name()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        session: object = _NO_SESSION
+        published = 0
+
+        for entry in read_recording(path):
+            if entry.get("session") != session:
+                session = entry.get("session")
+                started = loop.time()
+            if self._speed is not None:
+                delay = entry["offset"] / self._speed - (loop.time() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            destination = self._destination_override or known.get(entry["destination"])
+            if destination is None:
+                destination = MessagingDestination(
+                    name=entry["destination"],
+                    topic=entry["topic"],
+                    subscription=entry["subscription"],
+                )
+            await self._publisher.publish(
+                destination,
+                mask_sensitive_fields(entry["message"], self._sensitive_fields),
+                correlation_id=entry.get("attributes", {}).get("correlation_id"),
+            )
+            published += 1
+
+        logger.info(
+            "Replayed message recording",
+            extra={"path": str(path), "published": published, "speed": self._speed},
+        )
+        return published
+
+
+DEFAULT_RECORDER_SUFFIX = "-recorder"
+
+
+def recorder_destination(
+    destination: MessagingDestination,
+    subscription: str | None = None,
+) -> MessagingDestination:
+    """Destination the recorder consumes from: same topic, dedicated subscription.
+
+    Args:
+        destination: Destination whose topic is recorded.
+        subscription: Subscription name; defaults to ``<subscription>-recorder``.
+
+    Raises:
+        ValueError: If the subscription is the one the agents consume from.
+    """
+    name = subscription or f"{destination.subscription}{DEFAULT_RECORDER_SUFFIX}"
+    if name == destination.subscription:
+        raise ValueError(
+            f"Refusing to record from agent subscription {name}; use a dedicated subscription"
+        )
+    return MessagingDestination(name=destination.name, topic=destination.topic, subscription=name)
+
+
+async def _record(
+    path: str,
+    destinations: list[MessagingDestination],
+    subscription: str | None = None,
+) -> None:
+    from .pubsub import PubSubSubscriber
+
+    recorder = MessageRecorder(path)
+    subscriber = PubSubSubscriber(get_messaging_settings())
+    try:
+        await subscriber.connect()
+        for destination in destinations:
+            source = recorder_destination(destination, subscription)
+            await subscriber.ensure_subscription(source)
+            await subscriber.subscribe(source, recorder.tap(destination))
+        await subscriber.start_consuming()
+    finally:
+        await subscriber.disconnect()
+        recorder.close()
+
+
+async def _replay(path: str, speed: float, destination: MessagingDestination | None) -> None:
+    from .pubsub import PubSubPublisher
+
+    publisher = PubSubPublisher(get_messaging_settings())
+    await publisher.connect()
+    try:
+        await MessageReplayer(publisher, speed=speed, destination_override=destination).replay(path)
+    finally:
+        await publisher.disconnect()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point."""
+    known = _destinations_by_name()
+    parser = argparse.ArgumentParser(description="Record and replay Aegis message traffic.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record messages from subscriptions")
+    record.add_argument("path")
+    record.add_argument(
+        "--destination",
+        action="append",
+        choices=sorted(known),
+        help="Destination name to record (repeatable, default: test-generation-requested)",
+    )
+    record.add_argument(
+        "--subscription",
+        help=(
+            "Dedicated subscription to record from (single destination only; "
+            f"default: <agent subscription>{DEFAULT_RECORDER_SUFFIX})"
+        ),
+    )
+
+    replay = commands.add_parser("replay", help="Publish a recording")
+    replay.add_argument("path")
+    replay.add_argument("--speed", type=float, default=1.0, help="Time scale, 0 for max speed")
+    replay.add_argument("--destination", choices=sorted(known), help="Override destination")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "record":
+        names = args.destination or [Topics.TEST_GENERATION_REQUESTED.name]
+        if args.subscription and len(names) > 1:
+            parser.error("--subscription can only be used with a single --destination")
+        asyncio.run(_record(args.path, [known[name] for name in names], args.subscription))
+    else:
+        override = known[args.destination] if args.destination else None
+        asyncio.run(_replay(args.path, args.speed, override))
+
+
+if __name__ == "__main__":
+    main()
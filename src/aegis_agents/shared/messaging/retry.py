@@ -0,0 +1,195 @@
+"""Bounded, delayed retries for failed message handlers.
+
+A failed delivery is nacked only after an exponential backoff, so a failing
+handler cannot spin in a tight redelivery loop. While it waits the message
+stays leased (the Pub/Sub client keeps extending its ack deadline), so the
+backoff also holds back flow control. After ``max_attempts`` deliveries, or
+immediately for ``NonRetryableError``, the message is acked and handed to
+an ``on_failure`` callback that publishes the agent's error event.
+``DeferredDelivery`` (e.g. a full scheduler backlog) is not a failure: the
+message is nacked at once, giving its lease back, without using up an
+attempt. How soon Pub/Sub redelivers it is set by the subscription's retry
+policy (``minimum_backoff``).
+
+Delivery attempts come from Pub/Sub when the subscription has a dead-letter
+policy (``message.delivery_attempt``); otherwise they are counted in
+process, so a redelivery to another replica starts counting again.
+
+Usage:
+    delivery = RetryingDelivery(RetryPolicy(max_attempts=5), on_failure=publish_error)
+    await delivery.deliver(message, handler, body, correlation_id)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any], str | None], Awaitable[None]]
+FailureHandler = Callable[[dict[str, Any], str | None, BaseException], Awaitable[None]]
+
+_MAX_TRACKED_MESSAGES = 10_000
+
+
+class NonRetryableError(Exception):
+    """Raised by handlers for failures that retrying cannot fix.
+
+    The message is acked and reported through ``on_failure`` right away.
+    """
+
+
+class DeferredDelivery(Exception):
+    """Raised when a message cannot be handled yet and should come back later.
+
+    The message is nacked immediately, so it stops counting against flow
+    control, and the delivery does not count as a failed attempt.
+    """
+
+
+class LeasedMessage(Protocol):
+    """The part of a Pub/Sub message needed to settle it."""
+
+    message_id: str
+    delivery_attempt: int | None
+
+    def ack(self) -> None: ...
+
+    def nack(self) -> None: ...
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often, and how long apart, a failed message is redelivered.
+
+    Attributes:
+        max_attempts: Deliveries before the message is given up on.
+        initial_backoff: Seconds to wait before the first redelivery.
+        max_backoff: Upper bound for the exponential backoff, in seconds.
+    """
+
+    max_attempts: int = 5
+    initial_backoff: float = 10.0
+    max_backoff: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before redelivering a message that failed on ``attempt`` (1-based)."""
+        return min(self.max_backoff, self.initial_backoff * 2 ** max(attempt - 1, 0))
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether a failure on ``attempt`` (1-based) is worth another delivery."""
+        return not isinstance(error, NonRetryableError) and attempt < self.max_attempts
+
+
+class RetryingDelivery:
+    """Runs handlers and acks, delays-then-nacks, or gives up on their messages."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        on_failure: FailureHandler | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """Initialize the delivery policy.
+
+        Args:
+            policy: Retry limits and backoff (defaults to ``RetryPolicy()``).
+            on_failure: Called with (message, correlation_id, error) once a
+                message is given up on; typically publishes an error event.
+            sleep: Awaitable used to wait out the backoff.
+        """
+        self._policy = policy or RetryPolicy()
+        self._on_failure = on_failure
+        self._sleep = sleep
+        self._attempts: OrderedDict[str, int] = OrderedDict()
+
+    async def deliver(
+        self,
+        message: LeasedMessage,
+        handler: Handler,
+        body: dict[str, Any],
+        correlation_id: str | None,
+    ) -> None:
+        """Run the handler for a message and settle it.
+
+        Args:
+            message: Leased message to ack or nack.
+            handler: Async handler receiving (body, correlation_id).
+            body: Decoded message payload.
+            correlation_id: Optional correlation ID for tracing.
+        """
+        try:
+            await handler(body, correlation_id)
+        except asyncio.CancelledError:
+            # Shutting down: hand the message back without counting an attempt.
+            message.nack()
+            raise
+        except DeferredDelivery as e:
+            logger.info(
+                "Message deferred, handing it back to Pub/Sub",
+                extra={
+                    "message_id": message.message_id,
+                    "correlation_id": correlation_id,
+                    "reason": str(e),
+                },
+            )
+            message.nack()
+        except Exception as e:
+            await self._handle_failure(message, body, correlation_id, e)
+        else:
+            self._attempts.pop(message.message_id, None)
+            message.ack()
+
+    def _attempt(self, message: LeasedMessage) -> int:
+        if message.delivery_attempt:
+            return message.delivery_attempt
+        attempt = self._attempts.pop(message.message_id, 0) + 1
+        self._attempts[message.message_id] = attempt
+        while len(self._attempts) > _MAX_TRACKED_MESSAGES:
+            self._attempts.popitem(last=False)
+        return attempt
+
+    async def _handle_failure(
+        self,
+        message: LeasedMessage,
+        body: dict[str, Any],
+        correlation_id: str | None,
+        error: Exception,
+    ) -> None:
+        attempt = self._attempt(message)
+        log_extra = {
+            "message_id": message.message_id,
+            "correlation_id": correlation_id,
+            "attempt": attempt,
+            "max_attempts": self._policy.max_attempts,
+            "error": repr(error),
+        }
+        if self._policy.should_retry(error, attempt):
+            delay = self._policy.backoff(attempt)
+            logger.warning(
+                "Handler failed, redelivering after backoff",
+                extra={**log_extra, "backoff_seconds": delay},
+            )
+            try:
+                await self._sleep(delay)
+            finally:
+                message.nack()
+            return
+
+        logger.error("Handler failed permanently, acknowledging message", extra=log_extra)
+        self._attempts.pop(message.message_id, None)
+        message.ack()
+        if self._on_failure is None:
+            return
+        try:
+            await self._on_failure(body, correlation_id, error)
+        except Exception:
+            logger.exception(
+                "Failed to report handler failure",
+                extra={"message_id": message.message_id, "correlation_id": correlation_id},
+            )
@@ -0,0 +1,240 @@
+"""Priority and fair-share scheduling between subscriptions and handlers.
+
+Messages are admitted to their handlers by a weighted fair queue keyed by
+tenant (``test_project.id`` by default) inside strict priority classes.
+A global concurrency limit and a per-tenant cap bound how many handlers run
+at once.
+
+The scheduler can only reorder messages the subscriber has leased. Waiting
+messages stay unacked and count against the flow-control window
+(``pubsub_max_outstanding_messages``), so without a backlog limit a single
+tenant's flood fills the window and other tenants' messages are never
+pulled. ``tenant_max_pending`` caps each tenant's backlog: further messages
+raise ``SchedulerOverloadedError``, a ``DeferredDelivery`` that the
+subscriber nacks at once without using up a retry attempt, so the rejected
+message gives its lease back straight away. Pub/Sub redelivers it after the
+subscription's retry policy ``minimum_backoff``; set one on the
+subscription, or rejected messages come straight back. Keep
+``tenant_max_pending + tenant_concurrency`` well below the flow-control
+window so leases remain for the other tenants.
+
+Usage:
+    scheduler = FairShareScheduler(
+        max_concurrency=16,
+        tenant_concurrency=4,
+        tenant_max_pending=settings.pubsub_max_outstanding_messages // 10,
+    )
+    await subscriber.subscribe(
+        Topics.TEST_GENERATION_REQUESTED,
+        scheduler.wrap(handle_test_generation_request),
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .retry import DeferredDelivery
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any], str | None], Awaitable[None]]
+TenantKey = Callable[[dict[str, Any]], str]
+PriorityKey = Callable[[dict[str, Any]], int]
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+DEFAULT_TENANT = "default"
+
+
+class SchedulerOverloadedError(DeferredDelivery):
+    """Raised when a tenant's backlog is full; the message is redelivered later."""
+
+
+def tenant_from_test_project(message: dict[str, Any]) -> str:
+    """Tenant key: ``test_project.id`` of the message (``default`` when missing)."""
+    project = message.get("test_project")
+    if isinstance(project, dict) and project.get("id") is not None:
+        return str(project["id"])
+    return DEFAULT_TENANT
+
+
+def generation_priority(message: dict[str, Any]) -> int:
+    """Priority class for generation requests and plans.
+
+    Jobs that skip approval (``approve_before_generation=false``) or contain
+    ``PERFORMANCE`` scenarios run in the high class; everything else is normal.
+    """
+    if message.get("approve_before_generation") is False:
+        return PRIORITY_HIGH
+    for feature in message.get("features") or ():
+        for scenario in feature.get("scenarios") or ():
+            if str(scenario.get("type") or "").upper() == "PERFORMANCE":
+                return PRIORITY_HIGH
+    return PRIORITY_NORMAL
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    finish: float
+    sequence: int
+    tenant: str = field(compare=False)
+    admitted: asyncio.Future[None] = field(compare=False)
+
+
+class FairShareScheduler:
+    """Weighted fair queuing across tenants with priority classes and caps."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        tenant_concurrency: int | None = 4,
+        tenant_weights: Mapping[str, float] | None = None,
+        tenant_max_pending: int | None = None,
+        tenant_key: TenantKey = tenant_from_test_project,
+        priority_key: PriorityKey = generation_priority,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Handlers running at once across all tenants.
+            tenant_concurrency: Handlers running at once per tenant (``None`` = no cap).
+            tenant_weights: Relative share per tenant (default weight is 1.0).
+            tenant_max_pending: Waiting messages per tenant before new ones are
+                rejected with ``SchedulerOverloadedError`` (``None`` = unbounded).
+            tenant_key: Extracts the tenant from a message.
+            priority_key: Extracts the priority class (lower runs first).
+        """
+        self._max_concurrency = max_concurrency
+        self._tenant_concurrency = tenant_concurrency
+        self._tenant_weights = dict(tenant_weights or {})
+        self._tenant_max_pending = tenant_max_pending
+        self._tenant_key = tenant_key
+        self._priority_key = priority_key
+
+        self._queues: dict[str, list[_Ticket]] = {}
+        self._running: dict[str, int] = {}
+        self._last_finish: dict[str, float] = {}
+        self._total_running = 0
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        """Messages waiting for admission."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def running(self) -> int:
+        """Handlers currently running."""
+        return self._total_running
+
+    def wrap(self, handler: Handler) -> Handler:
+        """Wrap a subscriber handler so it only runs when admitted."""
+
+        async def scheduled(message: dict[str, Any], correlation_id: str | None) -> None:
+            await self.run(handler, message, correlation_id)
+
+        return scheduled
+
+    async def run(
+        self,
+        handler: Handler,
+        message: dict[str, Any],
+        correlation_id: str | None,
+    ) -> None:
+        """Wait for admission, then run the handler.
+
+        Raises:
+            SchedulerOverloadedError: If the tenant's backlog is full.
+        """
+        tenant = self._tenant_key(message)
+        ticket = self._enqueue(tenant, self._priority_key(message), correlation_id)
+        try:
+            await ticket.admitted
+        except asyncio.CancelledError:
+            self._withdraw(ticket)
+            raise
+
+        try:
+            await handler(message, correlation_id)
+        finally:
+            self._running[tenant] -= 1
+            self._total_running -= 1
+            self._dispatch()
+
+    def _enqueue(self, tenant: str, priority: int, correlation_id: str | None) -> _Ticket:
+        queue = self._queues.setdefault(tenant, [])
+        if self._tenant_max_pending is not None and len(queue) >= self._tenant_max_pending:
+            logger.warning(
+                "Tenant backlog full, rejecting message for redelivery",
+                extra={"tenant": tenant, "correlation_id": correlation_id},
+            )
+            raise SchedulerOverloadedError(f"Backlog full for tenant {tenant}")
+
+        weight = self._tenant_weights.get(tenant, 1.0)
+        start = max(self._virtual_time, self._last_finish.get(tenant, 0.0))
+        finish = start + 1.0 / weight
+        self._last_finish[tenant] = finish
+
+        ticket = _Ticket(
+            priority=priority,
+            finish=finish,
+            sequence=next(self._sequence),
+            tenant=tenant,
+            admitted=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(queue, ticket)
+        logger.debug(
+            "Queued message",
+            extra={"tenant": tenant, "priority": priority, "correlation_id": correlation_id},
+        )
+        self._dispatch()
+        return ticket
+
+    def _withdraw(self, ticket: _Ticket) -> None:
+        if ticket.admitted.done() and not ticket.admitted.cancelled():
+            # Admitted just before cancellation: release the slot it was given.
+            self._running[ticket.tenant] -= 1
+            self._total_running -= 1
+        else:
+            queue = self._queues.get(ticket.tenant, [])
+            if ticket in queue:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._total_running < self._max_concurrency:
+            best: _Ticket | None = None
+            for tenant, queue in self._queues.items():
+                if not queue:
+                    continue
+                if (
+                    self._tenant_concurrency is not None
+                    and self._running.get(tenant, 0) >= self._tenant_concurrency
+                ):
+                    continue
+                if best is None or queue[0] < best:
+                    best = queue[0]
+            if best is None:
+                return
+
+            heapq.heappop(self._queues[best.tenant])
+            if not self._queues[best.tenant]:
+                del self._queues[best.tenant]
+            if best.admitted.done():
+                continue
+
+            self._virtual_time = max(self._virtual_time, best.finish)
+            self._running[best.tenant] = self._running.get(best.tenant, 0) + 1
+            self._total_running += 1
+            best.admitted.set_result(None)
@@ -0,0 +1,23 @@
+"""Deterministic test-data synthesis from JSON Schemas."""
+
+from .synthesizer import (
+    SCENARIO_TYPE_VARIANTS,
+    CompiledSchema,
+    SchemaSynthesisError,
+    compile_schema,
+    schema_hash,
+    synthesize_outline_rows,
+    synthesize_request_bodies,
+    variant_for_scenario_type,
+)
+
+__all__ = [
+    "SCENARIO_TYPE_VARIANTS",
+    "CompiledSchema",
+    "SchemaSynthesisError",
+    "compile_schema",
+    "schema_hash",
+    "synthesize_outline_rows",
+    "synthesize_request_bodies",
+    "variant_for_scenario_type",
+]
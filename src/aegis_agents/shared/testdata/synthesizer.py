@@ -0,0 +1,535 @@
+"""JSON Schema driven test-data synthesizer.
+
+A schema is compiled once into generator closures (cached by schema hash)
+that emit deterministic, seeded payloads for valid, boundary and invalid
+variants without any LLM round-trip.
+
+Supported keywords: ``type`` (including nullable type lists), ``enum``,
+``const``, ``format`` (email, uuid, date, date-time, uri, cpf),
+``minLength``/``maxLength``, ``minimum``/``maximum`` (and exclusive forms,
+numeric or draft-04/OpenAPI 3.0 booleans), ``minItems``/``maxItems``,
+``items``, ``properties``, ``required``, ``additionalProperties``,
+``oneOf``/``anyOf``, ``allOf`` (shallow merge) and local ``$ref`` pointers
+(``#/$defs/...``, ``#/components/schemas/...``). Any other constraint
+(``pattern``, ``multipleOf``, ``uniqueItems``, an unknown ``format``, ...)
+raises ``SchemaSynthesisError`` instead of silently generating data that
+does not satisfy it. Integer bounds are rounded inwards, and a required
+property without a schema of its own is generated from
+``additionalProperties`` (any value when that is absent).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import string
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Literal
+
+from ..contracts import ApiCallSpec, ScenarioOutlineHeader, ScenarioOutlineRow
+
+Variant = Literal["valid", "boundary", "invalid"]
+ValueFactory = Callable[[random.Random], Any]
+
+SCENARIO_TYPE_VARIANTS: dict[str, Variant] = {
+    "POSITIVE": "valid",
+    "NEGATIVE": "invalid",
+    "EDGE_CASE": "boundary",
+    "SECURITY": "invalid",
+    "PERFORMANCE": "valid",
+}
+
+_DEFAULT_MAX_LENGTH = 16
+_DEFAULT_MAX_ITEMS = 3
+_DEFAULT_INT_RANGE = (0, 1_000)
+_ALPHABET = string.ascii_letters + string.digits
+_EPOCH = date(2000, 1, 1)
+_ANNOTATIONS = frozenset(
+    {
+        "title",
+        "description",
+        "example",
+        "examples",
+        "default",
+        "deprecated",
+        "readOnly",
+        "writeOnly",
+        "$schema",
+        "$id",
+        "$defs",
+        "definitions",
+        "components",
+        "nullable",
+    }
+)
+_KEYWORDS: dict[str, frozenset[str]] = {
+    "string": frozenset({"format", "minLength", "maxLength"}),
+    "integer": frozenset({"minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"}),
+    "number": frozenset({"minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"}),
+    "boolean": frozenset(),
+    "null": frozenset(),
+    "array": frozenset({"items", "minItems", "maxItems"}),
+    "object": frozenset({"properties", "required", "additionalProperties"}),
+}
+_OUTLINE_TYPE_ALIASES = {
+    "int": "integer",
+    "long": "integer",
+    "float": "number",
+    "double": "number",
+    "decimal": "number",
+    "bool": "boolean",
+    "str": "string",
+    "text": "string",
+}
+
+
+class SchemaSynthesisError(ValueError):
+    """Raised when a schema cannot be compiled into a generator."""
+
+
+@dataclass(frozen=True)
+class _Scope:
+    """Root document for ``$ref`` resolution and the references being expanded."""
+
+    root: dict[str, Any]
+    resolving: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class _Node:
+    valid: ValueFactory
+    boundary: list[ValueFactory] = field(default_factory=list)
+    invalid: list[ValueFactory] = field(default_factory=list)
+
+
+def _const(value: Any) -> ValueFactory:
+    return lambda rng: value
+
+
+def _cpf(rng: random.Random, valid: bool = True) -> str:
+    digits = [rng.randrange(10) for _ in range(9)]
+    for length in (9, 10):
+        total = sum(d * w for d, w in zip(digits, range(length + 1, 1, -1)))
+        check = (total * 10) % 11 % 10
+        digits.append(check)
+    if not valid:
+        digits[-1] = (digits[-1] + 1) % 10
+    text = "".join(map(str, digits))
+    return f"{text[:3]}.{text[3:6]}.{text[6:9]}-{text[9:]}"
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(_ALPHABET, k=length))
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _date(rng: random.Random) -> str:
+    return (_EPOCH + timedelta(days=rng.randrange(10_000))).isoformat()
+
+
+def _date_time(rng: random.Random) -> str:
+    start = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    return (start + timedelta(seconds=rng.randrange(800_000_000))).isoformat()
+
+
+_FORMATS: dict[str, tuple[ValueFactory, list[ValueFactory]]] = {
+    "email": (
+        lambda rng: f"{_random_text(rng, 8).lower()}@example.com",
+        [_const("not-an-email"), _const("user@")],
+    ),
+    "uuid": (_uuid, [_const("not-a-uuid")]),
+    "date": (_date, [_const("2024-13-45"), _const("not-a-date")]),
+    "date-time": (_date_time, [_const("2024-01-01T25:61:00Z"), _const("not-a-datetime")]),
+    "uri": (
+        lambda rng: f"https://example.com/{_random_text(rng, 8).lower()}",
+        [_const("not a uri")],
+    ),
+    "cpf": (
+        _cpf,
+        [lambda rng: _cpf(rng, valid=False), _const("000.000.000-00"), _const("123")],
+    ),
+}
+
+
+def _resolve_ref(ref: str, scope: _Scope) -> tuple[dict[str, Any], _Scope]:
+    if not ref.startswith("#"):
+        raise SchemaSynthesisError(f"Unsupported non-local $ref: {ref}")
+    if ref in scope.resolving:
+        raise SchemaSynthesisError(f"Recursive $ref cannot be synthesized: {ref}")
+    target: Any = scope.root
+    for token in ref[1:].lstrip("/").split("/") if ref != "#" else ():
+        token = token.replace("~1", "/").replace("~0", "~")
+        if not isinstance(target, dict) or token not in target:
+            raise SchemaSynthesisError(f"Unresolvable $ref: {ref}")
+        target = target[token]
+    if not isinstance(target, dict):
+        raise SchemaSynthesisError(f"$ref does not point to a schema: {ref}")
+    return target, _Scope(scope.root, (*scope.resolving, ref))
+
+
+def _infer_type(schema: dict[str, Any]) -> str:
+    for schema_type in ("object", "array", "number"):
+        if any(key in schema for key in _KEYWORDS[schema_type]):
+            return schema_type
+    # An untyped schema without constraints accepts any value; strings are one.
+    # Keywords that strings do not support are rejected when it is compiled.
+    return "string"
+
+
+def _compile(schema: dict[str, Any], scope: _Scope) -> _Node:
+    if not isinstance(schema, dict):
+        raise SchemaSynthesisError(f"Schema must be an object, got {type(schema).__name__}")
+
+    if "$ref" in schema:
+        target, inner = _resolve_ref(schema["$ref"], scope)
+        siblings = {k: v for k, v in schema.items() if k != "$ref"}
+        return _compile({**target, **siblings}, inner)
+
+    if "allOf" in schema:
+        merged: dict[str, Any] = {k: v for k, v in schema.items() if k != "allOf"}
+        for part in schema["allOf"]:
+            if "$ref" in part:
+                part, _ = _resolve_ref(part["$ref"], scope)
+            merged.setdefault("properties", {}).update(part.get("properties", {}))
+            merged["required"] = [*merged.get("required", []), *part.get("required", [])]
+            merged.update({k: v for k, v in part.items() if k not in ("properties", "required")})
+        return _compile(merged, scope)
+
+    for keyword in ("oneOf", "anyOf"):
+        if keyword in schema:
+            options = [_compile(option, scope) for option in schema[keyword]]
+            if not options:
+                raise SchemaSynthesisError(f"Empty {keyword} in schema")
+            return _Node(
+                valid=lambda rng: rng.choice(options).valid(rng),
+                boundary=[factory for option in options for factory in option.boundary],
+                invalid=options[0].invalid,
+            )
+
+    if "const" in schema:
+        return _Node(valid=_const(schema["const"]), invalid=[_const({"unexpected": True})])
+
+    if "enum" in schema:
+        values = list(schema["enum"])
+        if not values:
+            raise SchemaSynthesisError("Empty enum in schema")
+        return _Node(
+            valid=lambda rng: rng.choice(values),
+            boundary=[_const(values[0]), _const(values[-1])],
+            invalid=[_const("__INVALID_ENUM_VALUE__")],
+        )
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        types = [t for t in schema_type if t != "null"]
+        node = _compile({**schema, "type": types[0]}, scope) if types else _Node(valid=_const(None))
+        if "null" in schema_type:
+            return _Node(
+                valid=node.valid,
+                boundary=[*node.boundary, _const(None)],
+                invalid=node.invalid,
+            )
+        return node
+
+    if schema_type is None:
+        schema_type = _infer_type(schema)
+
+    compiler = _COMPILERS.get(schema_type)
+    if compiler is None:
+        raise SchemaSynthesisError(f"Unsupported schema type: {schema_type}")
+    unsupported = sorted(set(schema) - _ANNOTATIONS - _KEYWORDS[schema_type] - {"type"})
+    if unsupported:
+        raise SchemaSynthesisError(
+            f"Unsupported {schema_type} schema keywords: {', '.join(unsupported)}"
+        )
+    return compiler(schema, scope)
+
+
+def _compile_string(schema: dict[str, Any], scope: _Scope) -> _Node:
+    fmt = schema.get("format")
+    if fmt is not None:
+        if fmt not in _FORMATS:
+            raise SchemaSynthesisError(f"Unsupported string format: {fmt}")
+        valid, invalid = _FORMATS[fmt]
+        return _Node(valid=valid, boundary=[valid], invalid=[*invalid, _const(None)])
+
+    min_length = int(schema.get("minLength", 1))
+    max_length = int(schema.get("maxLength", max(min_length, _DEFAULT_MAX_LENGTH)))
+    if min_length > max_length:
+        raise SchemaSynthesisError(f"minLength {min_length} > maxLength {max_length}")
+
+    invalid: list[ValueFactory] = [_const(12345), _const(None)]
+    if min_length > 0:
+        invalid.append(lambda rng: _random_text(rng, min_length - 1))
+    if "maxLength" in schema:
+        invalid.append(lambda rng: _random_text(rng, max_length + 1))
+    return _Node(
+        valid=lambda rng: _random_text(rng, rng.randint(min_length, max_length)),
+        boundary=[
+            lambda rng: _random_text(rng, min_length),
+            lambda rng: _random_text(rng, max_length),
+        ],
+        invalid=invalid,
+    )
+
+
+def _bound(
+    schema: dict[str, Any], inclusive: str, exclusive: str, lower: bool, is_integer: bool
+) -> float | None:
+    """Tightest inclusive bound from ``minimum``/``maximum`` and their exclusive forms.
+
+    A boolean ``exclusive*`` (draft-04, OpenAPI 3.0) only marks the inclusive
+    keyword as exclusive; a number (draft-06+) is a bound of its own. Exclusive
+    bounds move inwards by 0.01, and integer bounds are rounded inwards to the
+    nearest integer that satisfies them (``minimum: 1.5`` becomes 2).
+    """
+
+    def inward(value: float, is_exclusive: bool) -> float:
+        if is_integer:
+            if lower:
+                return math.floor(value) + 1 if is_exclusive else math.ceil(value)
+            return math.ceil(value) - 1 if is_exclusive else math.floor(value)
+        if not is_exclusive:
+            return value
+        return value + 0.01 if lower else value - 0.01
+
+    value = schema.get(inclusive)
+    exclusive_value = schema.get(exclusive)
+    bounds: list[float] = []
+    if value is not None:
+        bounds.append(inward(value, exclusive_value is True))
+    if exclusive_value is not None and not isinstance(exclusive_value, bool):
+        bounds.append(inward(exclusive_value, True))
+    if not bounds:
+        return None
+    return max(bounds) if lower else min(bounds)
+
+
+def _compile_number(schema: dict[str, Any], scope: _Scope) -> _Node:
+    is_integer = schema.get("type") == "integer"
+    step = 1 if is_integer else 0.01
+    lower = _bound(schema, "minimum", "exclusiveMinimum", True, is_integer)
+    upper = _bound(schema, "maximum", "exclusiveMaximum", False, is_integer)
+    low = _DEFAULT_INT_RANGE[0] if lower is None else lower
+    high = max(low, _DEFAULT_INT_RANGE[1]) if upper is None else upper
+    if lower is None and upper is not None:
+        low = min(low, high)
+    if low > high:
+        raise SchemaSynthesisError(f"Empty numeric range [{low}, {high}]")
+
+    if is_integer:
+        valid: ValueFactory = lambda rng: rng.randint(low, high)  # noqa: E731
+    else:
+        valid = lambda rng: round(rng.uniform(low, high), 2)  # noqa: E731
+
+    invalid: list[ValueFactory] = [_const("not-a-number"), _const(None)]
+    if lower is not None:
+        invalid.append(_const(low - step))
+    if upper is not None:
+        invalid.append(_const(high + step))
+    if is_integer:
+        invalid.append(_const(low + 0.5))
+    return _Node(valid=valid, boundary=[_const(low), _const(high)], invalid=invalid)
+
+
+def _compile_boolean(schema: dict[str, Any], scope: _Scope) -> _Node:
+    return _Node(
+        valid=lambda rng: rng.random() < 0.5,
+        boundary=[_const(True), _const(False)],
+        invalid=[_const("true"), _const(None)],
+    )
+
+
+def _compile_null(schema: dict[str, Any], scope: _Scope) -> _Node:
+    return _Node(valid=_const(None), invalid=[_const("null")])
+
+
+def _compile_array(schema: dict[str, Any], scope: _Scope) -> _Node:
+    item = _compile(schema.get("items", {}), scope)
+    min_items = int(schema.get("minItems", 0))
+    max_items = int(schema.get("maxItems", max(min_items, _DEFAULT_MAX_ITEMS)))
+
+    def build(rng: random.Random, size: int) -> list[Any]:
+        return [item.valid(rng) for _ in range(size)]
+
+    invalid: list[ValueFactory] = [_const("not-an-array")]
+    if min_items > 0:
+        invalid.append(lambda rng: build(rng, min_items - 1))
+    if "maxItems" in schema:
+        invalid.append(lambda rng: build(rng, max_items + 1))
+    invalid.extend(
+        lambda rng, bad=bad: [bad(rng), *build(rng, max(min_items - 1, 0))] for bad in item.invalid
+    )
+    return _Node(
+        valid=lambda rng: build(rng, rng.randint(min_items, max_items)),
+        boundary=[lambda rng: build(rng, min_items), lambda rng: build(rng, max_items)],
+        invalid=invalid,
+    )
+
+
+def _compile_object(schema: dict[str, Any], scope: _Scope) -> _Node:
+    properties = {
+        name: _compile(sub, scope) for name, sub in schema.get("properties", {}).items()
+    }
+    required = list(dict.fromkeys(schema.get("required", [])))
+    additional = schema.get("additionalProperties", True)
+    for name in required:
+        if name in properties:
+            continue
+        if additional is False:
+            raise SchemaSynthesisError(
+                f"Required property {name!r} is not allowed by additionalProperties: false"
+            )
+        properties[name] = _compile(additional if isinstance(additional, dict) else {}, scope)
+    optional = [name for name in properties if name not in required]
+
+    def valid(rng: random.Random) -> dict[str, Any]:
+        payload = {name: properties[name].valid(rng) for name in required}
+        for name in optional:
+            if rng.random() < 0.5:
+                payload[name] = properties[name].valid(rng)
+        return payload
+
+    def full(rng: random.Random) -> dict[str, Any]:
+        return {name: node.valid(rng) for name, node in properties.items()}
+
+    def replace(name: str, factory: ValueFactory) -> ValueFactory:
+        return lambda rng: {**full(rng), name: factory(rng)}
+
+    def drop(name: str) -> ValueFactory:
+        return lambda rng: {key: value for key, value in full(rng).items() if key != name}
+
+    boundary = [
+        _const({}) if not required else lambda rng: {n: properties[n].valid(rng) for n in required},
+        full,
+        *(replace(name, factory) for name, node in properties.items() for factory in node.boundary),
+    ]
+    invalid = [
+        *(drop(name) for name in required),
+        *(replace(name, factory) for name, node in properties.items() for factory in node.invalid),
+        _const([]),
+    ]
+    return _Node(valid=valid, boundary=boundary, invalid=invalid)
+
+
+_COMPILERS: dict[str, Callable[[dict[str, Any], _Scope], _Node]] = {
+    "string": _compile_string,
+    "integer": _compile_number,
+    "number": _compile_number,
+    "boolean": _compile_boolean,
+    "null": _compile_null,
+    "array": _compile_array,
+    "object": _compile_object,
+}
+
+
+class CompiledSchema:
+    """A JSON Schema compiled into deterministic payload generators."""
+
+    def __init__(self, schema: dict[str, Any], schema_hash: str) -> None:
+        self.schema_hash = schema_hash
+        self._node = _compile(schema, _Scope(schema))
+
+    def generate(self, variant: Variant = "valid", count: int = 1, seed: int = 0) -> list[Any]:
+        """Generate payloads for a variant.
+
+        Boundary and invalid variants cycle through every compiled case, so the
+        first ``n`` payloads cover ``n`` distinct cases when available.
+
+        Args:
+            variant: ``valid``, ``boundary`` or ``invalid``.
+            count: Number of payloads.
+            seed: Seed making the output reproducible.
+        """
+        rng = random.Random(f"{self.schema_hash}:{variant}:{seed}")
+        if variant == "valid":
+            factory = self._node.valid
+            return [factory(rng) for _ in range(count)]
+
+        cases = self._node.boundary if variant == "boundary" else self._node.invalid
+        if not cases:
+            return []
+        return [cases[index % len(cases)](rng) for index in range(count)]
+
+    def case_count(self, variant: Variant) -> int:
+        """Number of distinct boundary or invalid cases (1 for valid)."""
+        if variant == "valid":
+            return 1
+        return len(self._node.boundary if variant == "boundary" else self._node.invalid)
+
+
+def _canonical(schema: dict[str, Any]) -> str:
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def schema_hash(schema: dict[str, Any]) -> str:
+    """Canonical hash of a JSON Schema."""
+    return hashlib.sha256(_canonical(schema).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(digest: str, canonical: str) -> CompiledSchema:
+    return CompiledSchema(json.loads(canonical), digest)
+
+
+def compile_schema(schema: dict[str, Any]) -> CompiledSchema:
+    """Compile a schema, reusing a cached compilation for identical schemas."""
+    canonical = _canonical(schema)
+    return _compile_cached(hashlib.sha256(canonical.encode("utf-8")).hexdigest(), canonical)
+
+
+def variant_for_scenario_type(scenario_type: str | None) -> Variant:
+    """Map a planned scenario type to the payload variant it needs."""
+    return SCENARIO_TYPE_VARIANTS.get((scenario_type or "").upper(), "valid")
+
+
+def synthesize_request_bodies(
+    api_call: ApiCallSpec,
+    scenario_type: str | None = None,
+    count: int = 1,
+    seed: int = 0,
+) -> list[Any]:
+    """Generate request bodies for an API call and scenario type.
+
+    Raises:
+        SchemaSynthesisError: If the API call has no request schema.
+    """
+    if not api_call.request_schema:
+        raise SchemaSynthesisError(f"API call {api_call.id} has no request schema")
+    compiled = compile_schema(api_call.request_schema)
+    return compiled.generate(variant_for_scenario_type(scenario_type), count, seed)
+
+
+def synthesize_outline_rows(
+    headers: Iterable[ScenarioOutlineHeader],
+    variant: Variant = "valid",
+    count: int = 1,
+    seed: int = 0,
+) -> list[ScenarioOutlineRow]:
+    """Generate outline rows from outline headers.
+
+    A header ``type`` is read as a JSON Schema type (common aliases such as
+    ``int`` are accepted) or, otherwise, as a string format such as ``cpf``.
+    Invalid variants that are not objects are skipped.
+    """
+    properties = {header.name: _outline_header_schema(header.type) for header in headers}
+    schema = {"type": "object", "properties": properties, "required": list(properties)}
+    rows = compile_schema(schema).generate(variant, count, seed)
+    return [ScenarioOutlineRow(data=row) for row in rows if isinstance(row, dict)]
+
+
+def _outline_header_schema(header_type: str | None) -> dict[str, Any]:
+    name = (header_type or "string").lower()
+    name = _OUTLINE_TYPE_ALIASES.get(name, name)
+    if name in _COMPILERS:
+        return {"type": name}
+    return {"type": "string", "format": name}
@@ -1,4 +1,110 @@
-"""Pydantic contracts for the test analyzer agent.
+"""Pydantic contracts for the test analyzer agent."""
 
-TODO: Define input and output event models.
-"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+ResultStatus = Literal["passed", "failed", "skipped", "error"]
+
+
+def outline_row_hash(data: dict[str, Any] | None) -> str:
+    """Stable hash of outline row data (empty string for plain scenarios)."""
+    if not data:
+        return ""
+    encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+class ScenarioResult(BaseModel):
+    """Result of a single scenario (or outline row) execution."""
+
+    specification_id: int = Field(..., description="Specification identifier")
+    feature_number: int = Field(..., description="Feature order in the plan")
+    scenario_number: int = Field(..., description="Scenario order within the feature")
+    status: ResultStatus = Field(..., description="Execution status")
+    outline_row: dict[str, Any] | None = Field(
+        default=None, description="Outline row data, when the scenario is an outline"
+    )
+    endpoint: str | None = Field(default=None, description="Endpoint under test (METHOD path)")
+    duration_ms: float | None = Field(default=None, ge=0, description="Execution duration")
+    error_message: str | None = Field(default=None, description="Failure or error message")
+
+    @property
+    def outline_row_hash(self) -> str:
+        """Stable hash of the outline row data (empty string for plain scenarios)."""
+        return outline_row_hash(self.outline_row)
+
+
+class OutcomeCounts(BaseModel):
+    """Pass/fail counters."""
+
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    error: int = 0
+
+    @property
+    def total(self) -> int:
+        """Total number of results counted."""
+        return self.passed + self.failed + self.skipped + self.error
+
+
+class LatencySummary(BaseModel):
+    """Latency distribution for an endpoint."""
+
+    count: int
+    min_ms: float
+    max_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    buckets: dict[str, int] = Field(
+        default_factory=dict, description="Histogram bucket upper bound (ms) -> count"
+    )
+
+
+class FailureCluster(BaseModel):
+    """Failures grouped by normalized error signature."""
+
+    signature: str
+    count: int
+    example: str
+    scenarios: list[str] = Field(
+        default_factory=list,
+        description="Sample of affected scenarios (specification.feature.scenario)",
+    )
+
+
+class AnalysisSummary(BaseModel):
+    """Incremental analysis summary, available mid-run."""
+
+    results_processed: int
+    totals: OutcomeCounts
+    features: dict[str, OutcomeCounts] = Field(
+        default_factory=dict, description="Counters keyed by 'specification.feature'"
+    )
+    scenarios: dict[str, OutcomeCounts] = Field(
+        default_factory=dict, description="Counters keyed by 'specification.feature.scenario'"
+    )
+    latency: dict[str, LatencySummary] = Field(default_factory=dict)
+    failure_clusters: list[FailureCluster] = Field(default_factory=list)
+
+
+class ScenarioVerdict(BaseModel):
+    """Historical verdict for a scenario (or outline row) after a new result."""
+
+    specification_id: int
+    feature_number: int
+    scenario_number: int
+    outline_row_hash: str = Field(
+        default="", description="Outline row hash, empty for plain scenarios"
+    )
+    runs: int = Field(..., description="Results recorded for this key")
+    failure_rate: float = Field(..., description="Failure rate within the rolling window")
+    flaky: bool = Field(..., description="Outcome flips within the rolling window")
+    regression: bool = Field(..., description="Failed after a stable passing streak")
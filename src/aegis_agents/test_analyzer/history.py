@@ -0,0 +1,299 @@
+"""Append-only execution history with O(1) flaky and regression detection.
+
+Each result is appended to a compact JSONL log and folded into per-scenario
+rolling statistics kept in memory. The log is replayed once when the store is
+opened; afterwards recording a result never rescans past runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from aegis_agents.shared.contracts import FeaturePlan, ScenarioOutline
+
+from .contracts import ScenarioResult, ScenarioVerdict, outline_row_hash
+
+logger = logging.getLogger(__name__)
+
+HistoryKey = tuple[int, int, int, str]
+
+_FAILED_STATUSES = frozenset({"failed", "error"})
+
+
+class ScenarioStats:
+    """Rolling statistics for a single history key.
+
+    The last ``window`` outcomes are kept as a bitmask (1 = failure), so every
+    update and every flakiness check is constant time.
+    """
+
+    __slots__ = ("runs", "window_bits", "window_size", "pass_streak", "last_failed")
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.window_bits = 0
+        self.window_size = 0
+        self.pass_streak = 0
+        self.last_failed = False
+
+    def snapshot(self) -> dict[str, int]:
+        """Serializable state, used when compacting the log."""
+        return {
+            "runs": self.runs,
+            "bits": self.window_bits,
+            "size": self.window_size,
+            "streak": self.pass_streak,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, int]) -> ScenarioStats:
+        """Restore statistics written by ``snapshot``."""
+        stats = cls()
+        stats.runs = snapshot["runs"]
+        stats.window_bits = snapshot["bits"]
+        stats.window_size = snapshot["size"]
+        stats.pass_streak = snapshot["streak"]
+        stats.last_failed = bool(stats.window_size and stats.window_bits & 1)
+        return stats
+
+    def record(self, failed: bool, window: int) -> None:
+        """Fold a new outcome into the statistics."""
+        self.runs += 1
+        self.window_bits = ((self.window_bits << 1) | int(failed)) & ((1 << window) - 1)
+        self.window_size = min(self.window_size + 1, window)
+        self.pass_streak = 0 if failed else self.pass_streak + 1
+        self.last_failed = failed
+
+    @property
+    def failures(self) -> int:
+        """Failures within the rolling window."""
+        return self.window_bits.bit_count()
+
+    @property
+    def flips(self) -> int:
+        """Pass/fail transitions within the rolling window."""
+        if self.window_size < 2:
+            return 0
+        mask = (1 << (self.window_size - 1)) - 1
+        return ((self.window_bits ^ (self.window_bits >> 1)) & mask).bit_count()
+
+
+class ExecutionHistoryStore:
+    """Append-only history keyed by (specification, feature, scenario, outline row).
+
+    Log lines are either outcome events (``[spec, feature, scenario, row_hash,
+    failed]``) or, after ``compact()``, per-key snapshots (``{"key": [...],
+    "runs": ...}``). Skipped results carry no pass/fail signal and are not
+    recorded.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        window: int = 20,
+        flaky_min_flips: int = 2,
+        regression_min_pass_streak: int = 3,
+    ) -> None:
+        """Open (or create) a history store.
+
+        Args:
+            path: JSONL file backing the store.
+            window: Number of recent outcomes kept per key.
+            flaky_min_flips: Pass/fail transitions in the window that mark a key as flaky.
+            regression_min_pass_streak: Consecutive passes after which a failure
+                is reported as a regression.
+        """
+        self._path = Path(path)
+        self._window = window
+        self._flaky_min_flips = flaky_min_flips
+        self._regression_min_pass_streak = regression_min_pass_streak
+        self._stats: dict[HistoryKey, ScenarioStats] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    @staticmethod
+    def key_for(result: ScenarioResult) -> HistoryKey:
+        """Build the history key of a result."""
+        return (
+            result.specification_id,
+            result.feature_number,
+            result.scenario_number,
+            result.outline_row_hash,
+        )
+
+    def record(self, result: ScenarioResult) -> ScenarioVerdict | None:
+        """Append a result and return the updated verdict for its key.
+
+        Skipped results are ignored and return the current verdict (if any).
+        """
+        key = self.key_for(result)
+        if result.status == "skipped":
+            return self.verdict(key)
+        failed = result.status in _FAILED_STATUSES
+        with self._path.open("a", encoding="utf-8") as log:
+            log.write(json.dumps([*key, int(failed)], separators=(",", ":")) + "\n")
+        return self._apply(key, failed)
+
+    def record_many(self, results: Iterable[ScenarioResult]) -> list[ScenarioVerdict]:
+        """Append a batch of results with a single file write (skipped results are ignored)."""
+        lines: list[str] = []
+        verdicts: list[ScenarioVerdict] = []
+        for result in results:
+            if result.status == "skipped":
+                continue
+            key = self.key_for(result)
+            failed = result.status in _FAILED_STATUSES
+            lines.append(json.dumps([*key, int(failed)], separators=(",", ":")))
+            verdicts.append(self._apply(key, failed))
+        if lines:
+            with self._path.open("a", encoding="utf-8") as log:
+                log.write("\n".join(lines) + "\n")
+        return verdicts
+
+    def verdict(self, key: HistoryKey) -> ScenarioVerdict | None:
+        """Return the current verdict for a key, if it has history."""
+        stats = self._stats.get(key)
+        return self._verdict(key, stats, regression=False) if stats else None
+
+    def is_flaky(self, key: HistoryKey) -> bool:
+        """Whether a key flips between pass and fail within the rolling window."""
+        stats = self._stats.get(key)
+        return bool(stats) and stats.flips >= self._flaky_min_flips
+
+    def needs_rerun(self, key: HistoryKey) -> bool:
+        """Whether a key last failed or is flaky."""
+        stats = self._stats.get(key)
+        return bool(stats) and (stats.last_failed or stats.flips >= self._flaky_min_flips)
+
+    def rerun_keys(self, specification_id: int) -> set[HistoryKey]:
+        """Keys of a specification that last failed or are flaky."""
+        return {
+            key for key in self._stats if key[0] == specification_id and self.needs_rerun(key)
+        }
+
+    def select_for_rerun(
+        self,
+        specification_id: int,
+        features: Iterable[FeaturePlan],
+    ) -> list[FeaturePlan]:
+        """Reduce a plan to the scenarios (and outline rows) that need re-execution.
+
+        Scenarios without history are not selected; outline scenarios keep only
+        the rows that failed or are flaky.
+        """
+        selected: list[FeaturePlan] = []
+        for feature in features:
+            scenarios = []
+            for scenario in feature.scenarios:
+                base = (specification_id, feature.feature_number, scenario.scenario_number)
+                if not scenario.outlines:
+                    if self.needs_rerun((*base, "")):
+                        scenarios.append(scenario)
+                    continue
+                outlines = [
+                    ScenarioOutline(
+                        headers=outline.headers,
+                        rows=[
+                            row
+                            for row in outline.rows
+                            if self.needs_rerun((*base, outline_row_hash(row.data)))
+                        ],
+                    )
+                    for outline in scenario.outlines
+                ]
+                outlines = [outline for outline in outlines if outline.rows]
+                if outlines:
+                    scenarios.append(scenario.model_copy(update={"outlines": outlines}))
+            if scenarios:
+                selected.append(feature.model_copy(update={"scenarios": scenarios}))
+        return selected
+
+    def compact(self) -> None:
+        """Rewrite the log as one snapshot line per key (run counts are preserved)."""
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as log:
+            for key, stats in self._stats.items():
+                snapshot = {"key": list(key), **stats.snapshot()}
+                log.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self._path)
+        logger.info("Compacted execution history", extra={"keys": len(self._stats)})
+
+    def _apply(self, key: HistoryKey, failed: bool) -> ScenarioVerdict:
+        stats, regression = self._update(key, failed)
+        return self._verdict(key, stats, regression)
+
+    def _update(self, key: HistoryKey, failed: bool) -> tuple[ScenarioStats, bool]:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ScenarioStats()
+        regression = (
+            failed
+            and not stats.last_failed
+            and stats.pass_streak >= self._regression_min_pass_streak
+        )
+        stats.record(failed, self._window)
+        return stats, regression
+
+    def _verdict(self, key: HistoryKey, stats: ScenarioStats, regression: bool) -> ScenarioVerdict:
+        specification_id, feature_number, scenario_number, row_hash = key
+        return ScenarioVerdict(
+            specification_id=specification_id,
+            feature_number=feature_number,
+            scenario_number=scenario_number,
+            outline_row_hash=row_hash,
+            runs=stats.runs,
+            failure_rate=stats.failures / stats.window_size if stats.window_size else 0.0,
+            flaky=stats.flips >= self._flaky_min_flips,
+            regression=regression,
+        )
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        ends_with_newline = True
+        with self._path.open(encoding="utf-8") as log:
+            for line_number, line in enumerate(log, start=1):
+                ends_with_newline = line.endswith("\n")
+                if not line.strip():
+                    continue
+                try:
+                    self._load_line(json.loads(line))
+                except (ValueError, TypeError, KeyError) as e:
+                    # Typically a torn line left by a crash mid-append.
+                    logger.warning(
+                        "Skipping malformed history line",
+                        extra={
+                            "path": str(self._path),
+                            "line_number": line_number,
+                            "error": str(e),
+                        },
+                    )
+        if not ends_with_newline:
+            # Terminate a torn tail so the next append starts on a fresh line.
+            with self._path.open("a", encoding="utf-8") as log:
+                log.write("\n")
+        logger.info(
+            "Loaded execution history",
+            extra={"path": str(self._path), "keys": len(self._stats)},
+        )
+
+    def _load_line(self, entry: Any) -> None:
+        if isinstance(entry, dict):
+            key = _history_key(entry["key"])
+            self._stats[key] = ScenarioStats.from_snapshot(entry)
+            return
+        *raw_key, failed = entry
+        self._update(_history_key(raw_key), bool(failed))
+
+
+def _history_key(raw: list[Any]) -> HistoryKey:
+    specification_id, feature_number, scenario_number, row_hash = raw
+    return int(specification_id), int(feature_number), int(scenario_number), str(row_hash)
@@ -1,4 +1,339 @@
 """Core logic for the test analyzer agent.
 
-TODO: Implement analysis logic with deterministic behavior.
+Execution results are consumed as a stream (JSONL or JUnit XML parsed
+iteratively) and folded into incremental aggregates, so memory stays flat
+regardless of the number of outline rows and summaries can be taken mid-run.
 """
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
+from .contracts import (
+    AnalysisSummary,
+    FailureCluster,
+    LatencySummary,
+    OutcomeCounts,
+    ScenarioResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is unbounded).
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 30_000, 60_000,
+)
+OVERFLOW_SIGNATURE = "<other>"
+
+# Text right before a number that makes it an HTTP status code: "status 404",
+# "status code: 500", "HTTP/1.1 503", or "expected status 200 but got 500".
+_STATUS_CONTEXT = re.compile(
+    r"(?:\b(?:status(?:[ _]code)?|response code|http(?:/\d(?:\.\d)?)?)"
+    r"|\bstatus\b.*\b(?:expected|got|was|received|actual))\s*[:=]?\s*$",
+    re.I,
+)
+
+
+def _normalize_number(match: re.Match[str]) -> str:
+    number, text = match.group(), match.string
+    has_unit = match.end() < len(text) and text[match.end()].isalpha()
+    if (
+        not has_unit
+        and number.isdigit()
+        and 100 <= int(number) <= 599
+        and _STATUS_CONTEXT.search(text, 0, match.start())
+    ):
+        return number
+    # Unit suffixes ("5000ms", "12s", "2048bytes") stay; only the value varies.
+    return "<num>"
+
+
+_SIGNATURE_RULES: tuple[tuple[re.Pattern[str], str | Callable[[re.Match[str]], str]], ...] = (
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?"), "<timestamp>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.I), "<hex>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    # HTTP status codes are kept after a status context: they distinguish failure kinds.
+    (re.compile(r"(?<!HTTP/)(?<!HTTP/\d\.)\b\d+(?:\.\d+)?", re.I), _normalize_number),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def normalize_error_signature(message: str, max_length: int = 200) -> str:
+    """Normalize an error message so equivalent failures share a signature.
+
+    Volatile tokens (ids, timestamps, quoted values, numbers) are replaced by
+    placeholders and only the first line is kept. A number is kept only when
+    it is an HTTP status code following a status context such as ``status``
+    or ``HTTP``; numbers with a unit suffix (``5000ms``) keep the unit.
+    """
+    first_line = message.strip().splitlines()[0] if message.strip() else ""
+    for pattern, replacement in _SIGNATURE_RULES:
+        first_line = pattern.sub(replacement, first_line)
+    return first_line.strip()[:max_length]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with constant memory."""
+
+    __slots__ = ("counts", "count", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def add(self, duration_ms: float) -> None:
+        """Record a duration."""
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return min(upper, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> LatencySummary:
+        """Build the latency summary contract."""
+        labels = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return LatencySummary(
+            count=self.count,
+            min_ms=self.min_ms if self.count else 0.0,
+            max_ms=self.max_ms,
+            mean_ms=self.total_ms / self.count if self.count else 0.0,
+            p50_ms=self.percentile(0.50),
+            p95_ms=self.percentile(0.95),
+            p99_ms=self.percentile(0.99),
+            buckets={label: count for label, count in zip(labels, self.counts) if count},
+        )
+
+
+class _Cluster:
+    __slots__ = ("count", "example", "scenarios")
+
+    def __init__(self, example: str) -> None:
+        self.count = 0
+        self.example = example
+        self.scenarios: list[str] = []
+
+
+class ResultAggregator:
+    """Incrementally aggregates scenario results.
+
+    State grows with the number of distinct scenarios, endpoints and (capped)
+    failure signatures, never with the number of results or outline rows.
+    """
+
+    def __init__(self, max_clusters: int = 100, max_cluster_samples: int = 10) -> None:
+        """Initialize the aggregator.
+
+        Args:
+            max_clusters: Maximum distinct failure signatures; extra ones are
+                folded into a single overflow cluster.
+            max_cluster_samples: Maximum scenario samples kept per cluster.
+        """
+        self._max_clusters = max_clusters
+        self._max_cluster_samples = max_cluster_samples
+        self._processed = 0
+        self._totals = OutcomeCounts()
+        self._features: dict[str, OutcomeCounts] = {}
+        self._scenarios: dict[str, OutcomeCounts] = {}
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._clusters: dict[str, _Cluster] = {}
+
+    @property
+    def results_processed(self) -> int:
+        """Number of results aggregated so far."""
+        return self._processed
+
+    def add(self, result: ScenarioResult) -> None:
+        """Fold a single result into the aggregates."""
+        self._processed += 1
+        feature_key = f"{result.specification_id}.{result.feature_number}"
+        scenario_key = f"{feature_key}.{result.scenario_number}"
+
+        for counts in (
+            self._totals,
+            self._features.setdefault(feature_key, OutcomeCounts()),
+            self._scenarios.setdefault(scenario_key, OutcomeCounts()),
+        ):
+            setattr(counts, result.status, getattr(counts, result.status) + 1)
+
+        if result.endpoint and result.duration_ms is not None:
+            self._latency.setdefault(result.endpoint, LatencyHistogram()).add(result.duration_ms)
+
+        if result.status in ("failed", "error"):
+            self._add_failure(result.error_message or result.status, scenario_key)
+
+    def consume(
+        self,
+        results: Iterable[ScenarioResult],
+        on_progress: Callable[[AnalysisSummary], None] | None = None,
+        progress_every: int = 1_000,
+    ) -> AnalysisSummary:
+        """Aggregate a stream of results.
+
+        Args:
+            results: Result stream (e.g. from ``iter_jsonl_results``).
+            on_progress: Optional callback receiving intermediate summaries.
+            progress_every: Number of results between intermediate summaries.
+
+        Returns:
+            Summary after the stream is exhausted.
+        """
+        for result in results:
+            self.add(result)
+            if on_progress and self._processed % progress_every == 0:
+                on_progress(self.summary())
+        return self.summary()
+
+    def summary(self) -> AnalysisSummary:
+        """Build a summary of everything aggregated so far."""
+        clusters = sorted(self._clusters.items(), key=lambda item: item[1].count, reverse=True)
+        return AnalysisSummary(
+            results_processed=self._processed,
+            totals=self._totals.model_copy(),
+            features={key: counts.model_copy() for key, counts in self._features.items()},
+            scenarios={key: counts.model_copy() for key, counts in self._scenarios.items()},
+            latency={endpoint: hist.summary() for endpoint, hist in self._latency.items()},
+            failure_clusters=[
+                FailureCluster(
+                    signature=signature,
+                    count=cluster.count,
+                    example=cluster.example,
+                    scenarios=list(cluster.scenarios),
+                )
+                for signature, cluster in clusters
+            ],
+        )
+
+    def _add_failure(self, message: str, scenario_key: str) -> None:
+        signature = normalize_error_signature(message)
+        cluster = self._clusters.get(signature)
+        if cluster is None:
+            if len(self._clusters) >= self._max_clusters:
+                signature = OVERFLOW_SIGNATURE
+            cluster = self._clusters.setdefault(signature, _Cluster(message[:500]))
+        cluster.count += 1
+        if (
+            len(cluster.scenarios) < self._max_cluster_samples
+            and scenario_key not in cluster.scenarios
+        ):
+            cluster.scenarios.append(scenario_key)
+
+
+def iter_jsonl_results(stream: Iterable[str | bytes]) -> Iterator[ScenarioResult]:
+    """Parse scenario results from a JSONL stream, one line at a time.
+
+    Blank lines are skipped; malformed lines are logged and skipped.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield ScenarioResult.model_validate_json(line)
+        except ValueError as e:
+            logger.warning(
+                "Skipping invalid result line",
+                extra={"line_number": line_number, "error": str(e)},
+            )
+
+
+def iter_junit_results(
+    source: str | IO[bytes],
+    specification_id: int | None = None,
+) -> Iterator[ScenarioResult]:
+    """Parse scenario results from JUnit XML without building the whole tree.
+
+    Identifiers are read from ``<property>`` entries (``specification_id``,
+    ``feature_number``, ``scenario_number``, ``endpoint``) declared on the
+    test case or any enclosing test suite. Processed elements are detached so
+    memory does not grow with the report size.
+
+    Args:
+        source: File path or binary file object.
+        specification_id: Fallback specification id when the report has none.
+    """
+    stack: list[ET.Element] = []
+    contexts: list[dict[str, str]] = []
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(element)
+            contexts.append({})
+            continue
+
+        stack.pop()
+        own = contexts.pop()
+        if element.tag == "properties" and contexts:
+            contexts[-1].update(
+                (prop.get("name", ""), prop.get("value", "")) for prop in element.iter("property")
+            )
+        elif element.tag == "testcase":
+            properties: dict[str, str] = {}
+            for context in contexts:
+                properties.update(context)
+            properties.update(own)
+            result = _junit_case_to_result(element, properties, specification_id)
+            if result is not None:
+                yield result
+
+        if element.tag in ("testcase", "testsuite") and stack:
+            stack[-1].remove(element)
+
+
+def _junit_case_to_result(
+    case: ET.Element,
+    properties: dict[str, str],
+    specification_id: int | None,
+) -> ScenarioResult | None:
+    status = "passed"
+    error_message: str | None = None
+    for tag in ("failure", "error", "skipped"):
+        child = case.find(tag)
+        if child is not None:
+            status = "failed" if tag == "failure" else tag
+            error_message = child.get("message") or (child.text or "").strip() or None
+            break
+
+    data: dict[str, Any] = {
+        "specification_id": properties.get("specification_id", specification_id),
+        "feature_number": properties.get("feature_number"),
+        "scenario_number": properties.get("scenario_number"),
+        "status": status,
+        "endpoint": properties.get("endpoint"),
+        "error_message": error_message,
+    }
+
+    try:
+        if case.get("time"):
+            # Surefire may emit thousands separators (time="1,234.5").
+            data["duration_ms"] = float(case.get("time", "0").replace(",", "")) * 1000
+        if properties.get("outline_row"):
+            data["outline_row"] = json.loads(properties["outline_row"])
+        return ScenarioResult.model_validate(data)
+    except ValueError as e:
+        logger.warning(
+            "Skipping invalid JUnit test case",
+            extra={"testcase": case.get("name"), "error": str(e)},
+        )
+        return None
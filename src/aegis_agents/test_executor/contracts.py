@@ -1,4 +1,16 @@
-"""Pydantic contracts for the test executor agent.
+"""Pydantic contracts for the test executor agent."""
 
-TODO: Define input and output event models.
-"""
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class ScenarioSetupRequirement(BaseModel):
+    """Supporting API calls a scenario needs before it can run."""
+
+    feature_number: int = Field(..., description="Feature the scenario belongs to")
+    scenario_number: int = Field(..., description="Scenario order within the feature")
+    setup_call_ids: list[int] = Field(
+        default_factory=list,
+        description="Supporting API call identifiers used as preconditions",
+    )
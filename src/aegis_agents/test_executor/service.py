@@ -1,4 +1,294 @@
 """Core logic for the test executor agent.
 
-TODO: Implement execution flow with deterministic behavior.
+Scenario setup is scheduled as a DAG built from the request's
+``supporting_api_calls``. Identical setup calls (same name, method and path
+template) are deduplicated, their
+results are shared by every scenario that needs the same precondition, and
+independent branches run concurrently.
 """
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any
+
+from aegis_agents.shared.contracts import ApiCallRef, TestGenerationRequest
+
+from .contracts import ScenarioSetupRequirement
+
+logger = logging.getLogger(__name__)
+
+SetupKey = tuple[str, str, str]
+SetupCallRunner = Callable[[ApiCallRef, Mapping[int, Any]], Awaitable[Any]]
+ScenarioRunner = Callable[[ScenarioSetupRequirement, Mapping[int, Any]], Awaitable[Any]]
+
+# "{id}" anywhere, or ":id" as a whole segment (not a custom method like "/customers:search").
+_PATH_PARAM = re.compile(r"\{[^/}]+\}|(?<=/):[^/]+")
+_CREATE_METHODS = frozenset({"POST", "PUT"})
+
+
+class SetupDependencyError(ValueError):
+    """Raised when setup dependencies are unknown or cyclic."""
+
+
+class SetupCallError(RuntimeError):
+    """Raised for scenarios whose setup call (or one of its prerequisites) failed."""
+
+    def __init__(self, call: ApiCallRef, cause: BaseException) -> None:
+        super().__init__(f"Setup call {call.method} {call.path} failed: {cause!r}")
+        self.call = call
+        self.cause = cause
+
+
+async def _gather_all(awaitables: Iterable[Awaitable[Any]]) -> list[Any]:
+    """Wait for every awaitable, then raise the first failure (if any)."""
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def _normalize_path(path: str) -> str:
+    """Normalize an endpoint path so equivalent templates compare equal."""
+    normalized = _PATH_PARAM.sub("{}", path.strip()).rstrip("/")
+    return normalized or "/"
+
+
+def setup_key(call: ApiCallRef) -> SetupKey:
+    """Build the deduplication key of a setup call (method + path template + name).
+
+    The name is part of the key: two calls on the same endpoint, such as
+    ``create-customer`` and ``create-vip-customer`` on ``POST /customers``,
+    set up different preconditions and must both run.
+    """
+    return call.method.upper(), _normalize_path(call.path), call.name
+
+
+class SetupDependencyGraph:
+    """DAG of supporting API calls used as scenario preconditions.
+
+    A call on a resource path (``GET /customers/{id}``) implicitly depends on
+    the call that creates the resource (``POST /customers``). Explicit edges
+    can be supplied for dependencies that cannot be inferred from paths.
+    """
+
+    def __init__(
+        self,
+        calls: Iterable[ApiCallRef],
+        explicit_dependencies: Mapping[int, Iterable[int]] | None = None,
+    ) -> None:
+        """Build the graph.
+
+        Args:
+            calls: Supporting API calls available for setup.
+            explicit_dependencies: Optional map of call id to prerequisite call ids.
+
+        Raises:
+            SetupDependencyError: If a dependency is unknown or the graph has a cycle.
+        """
+        self._calls: dict[SetupKey, ApiCallRef] = {}
+        self._key_by_id: dict[int, SetupKey] = {}
+        for call in calls:
+            key = setup_key(call)
+            self._calls.setdefault(key, call)
+            self._key_by_id[call.id] = key
+
+        self._dependencies: dict[SetupKey, set[SetupKey]] = {
+            key: self._infer_dependencies(key) for key in self._calls
+        }
+        for call_id, prerequisites in (explicit_dependencies or {}).items():
+            key = self.key_for(call_id)
+            self._dependencies[key].update(self.key_for(dep) for dep in prerequisites)
+
+        self._order = self._topological_order()
+
+    @classmethod
+    def from_request(cls, request: TestGenerationRequest) -> SetupDependencyGraph:
+        """Build the graph from a test generation request."""
+        return cls(request.supporting_api_calls)
+
+    @property
+    def order(self) -> list[SetupKey]:
+        """Setup keys in a valid execution order."""
+        return list(self._order)
+
+    def call(self, key: SetupKey) -> ApiCallRef:
+        """Return the representative call for a setup key."""
+        return self._calls[key]
+
+    def key_for(self, call_id: int) -> SetupKey:
+        """Resolve a call id to its deduplicated setup key."""
+        try:
+            return self._key_by_id[call_id]
+        except KeyError:
+            raise SetupDependencyError(f"Unknown supporting API call id: {call_id}") from None
+
+    def dependencies(self, key: SetupKey) -> frozenset[SetupKey]:
+        """Return the direct prerequisites of a setup key."""
+        return frozenset(self._dependencies[key])
+
+    def _infer_dependencies(self, key: SetupKey) -> set[SetupKey]:
+        _, path, _ = key
+        if "{}" not in path:
+            return set()
+        collection = path.rsplit("/{}", 1)[0] or "/"
+        return {
+            candidate
+            for candidate in self._calls
+            if candidate != key
+            and candidate[0] in _CREATE_METHODS
+            and candidate[1] == collection
+        }
+
+    def _topological_order(self) -> list[SetupKey]:
+        pending = {key: len(deps) for key, deps in self._dependencies.items()}
+        dependents: dict[SetupKey, list[SetupKey]] = {key: [] for key in self._dependencies}
+        for key, deps in self._dependencies.items():
+            for dep in deps:
+                dependents[dep].append(key)
+
+        ready = [key for key, count in pending.items() if count == 0]
+        order: list[SetupKey] = []
+        while ready:
+            key = ready.pop()
+            order.append(key)
+            for dependent in dependents[key]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self._dependencies):
+            cyclic = sorted(
+                f"{method} {path} ({name})"
+                for method, path, name in self._dependencies
+                if pending[(method, path, name)]
+            )
+            raise SetupDependencyError(f"Cyclic setup dependencies: {', '.join(cyclic)}")
+        return order
+
+
+class ScenarioSetupScheduler:
+    """Runs scenarios with shared, deduplicated and concurrent setup calls.
+
+    Each setup call runs at most once per scheduler; its result is shared by
+    every scenario that depends on it. The concurrency limit only applies to
+    running calls, never to waiting on prerequisites, so the DAG cannot
+    deadlock.
+    """
+
+    def __init__(
+        self,
+        graph: SetupDependencyGraph,
+        setup_runner: SetupCallRunner,
+        max_concurrency: int = 8,
+        correlation_id: str | None = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            graph: Setup dependency graph.
+            setup_runner: Async callable executing a setup call given the results
+                of its prerequisites (keyed by call id).
+            max_concurrency: Maximum number of setup calls running at once.
+            correlation_id: Optional correlation ID for tracing.
+        """
+        self._graph = graph
+        self._setup_runner = setup_runner
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._correlation_id = correlation_id
+        self._tasks: dict[SetupKey, asyncio.Task[Any]] = {}
+
+    async def resolve(self, call_ids: Iterable[int]) -> dict[int, Any]:
+        """Resolve setup fixtures for the given call ids.
+
+        Args:
+            call_ids: Supporting API call identifiers required by a scenario.
+
+        Returns:
+            Setup results keyed by the requested call ids.
+
+        Raises:
+            SetupCallError: If a requested call or one of its prerequisites failed.
+        """
+        keys = {call_id: self._graph.key_for(call_id) for call_id in call_ids}
+        results = await _gather_all(self._task_for(key) for key in keys.values())
+        return dict(zip(keys, results))
+
+    async def run_scenarios(
+        self,
+        scenarios: Iterable[ScenarioSetupRequirement],
+        scenario_runner: ScenarioRunner,
+    ) -> list[Any]:
+        """Run scenarios concurrently once their own preconditions are ready.
+
+        Args:
+            scenarios: Scenario setup requirements.
+            scenario_runner: Async callable executing a scenario with its fixtures.
+
+        Returns:
+            Scenario results in input order. A scenario whose setup or run failed
+            gets its exception (``SetupCallError`` for setup failures) in place of
+            a result; scenarios that do not depend on the failure are unaffected.
+        """
+
+        async def run(scenario: ScenarioSetupRequirement) -> Any:
+            fixtures = await self.resolve(scenario.setup_call_ids)
+            return await scenario_runner(scenario, fixtures)
+
+        scenario_list = list(scenarios)
+        logger.info(
+            "Running scenarios with shared setup",
+            extra={
+                "correlation_id": self._correlation_id,
+                "scenarios": len(scenario_list),
+                "setup_calls": len(self._graph.order),
+            },
+        )
+        results = await asyncio.gather(
+            *(run(scenario) for scenario in scenario_list),
+            return_exceptions=True,
+        )
+        return list(results)
+
+    def _task_for(self, key: SetupKey) -> asyncio.Task[Any]:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_setup(key))
+            self._tasks[key] = task
+        return task
+
+    async def _run_setup(self, key: SetupKey) -> Any:
+        dependencies = sorted(self._graph.dependencies(key))
+        dependency_results = await _gather_all(self._task_for(dep) for dep in dependencies)
+        prerequisites = {
+            self._graph.call(dep).id: result
+            for dep, result in zip(dependencies, dependency_results)
+        }
+
+        call = self._graph.call(key)
+        async with self._semaphore:
+            logger.debug(
+                "Running setup call",
+                extra={
+                    "correlation_id": self._correlation_id,
+                    "api_call_id": call.id,
+                    "method": call.method,
+                    "path": call.path,
+                },
+            )
+            try:
+                return await self._setup_runner(call, prerequisites)
+            except Exception as e:
+                logger.warning(
+                    "Setup call failed",
+                    extra={
+                        "correlation_id": self._correlation_id,
+                        "api_call_id": call.id,
+                        "error": repr(e),
+                    },
+                )
+                raise SetupCallError(call, e) from e
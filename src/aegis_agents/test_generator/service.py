@@ -1,4 +1,297 @@
 """Core logic for the test generator agent.
 
-TODO: Implement deterministic generation logic.
+Templates are compiled once into ``string.Template`` objects and every
+artifact is rendered into a single list buffer joined at the end. Each
+scenario is content-hashed so unchanged scenarios reuse their previously
+rendered fragment, and files are only rewritten when their content differs
+from what is already on disk.
+
+The rendered-scenario cache is a bounded, per-process LRU: a fresh worker
+renders every scenario once but still skips files that are unchanged on disk.
+Output is written per feature, so editing one scenario rewrites its feature
+file and step module, while the other scenarios reuse their cached fragments.
+
+Each step module binds its feature file with ``scenarios(...)`` and defines
+stubs that skip until implemented, so a freshly generated suite is collected
+by pytest-bdd and reports pending scenarios instead of failures.
 """
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+
+from aegis_agents.shared.contracts import FeaturePlan, ScenarioPlan
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATES: dict[str, str] = {
+    "feature_header": "${tags}Feature: ${feature_name}\n",
+    "scenario": "\n${tags}  ${keyword}: ${name}\n${description}${steps}${examples}",
+    "step": "    ${keyword} ${step_name}\n",
+    "step_definitions_header": (
+        "${docstring}\n\n"
+        "import pytest\n"
+        "from pytest_bdd import given, parsers, scenarios, then, when\n"
+        "\n"
+        "scenarios(${feature_path})\n"
+    ),
+    "step_decorator": "@${decorator}(parsers.parse(${pattern}))\n",
+    "step_definition": (
+        "\n\n${decorators}"
+        "def ${function_name}():\n"
+        "    ${docstring}\n"
+        "    pytest.skip(${skip_reason})\n"
+    ),
+}
+DEFAULT_CACHE_SIZE = 4096
+
+_STEP_KEYWORDS = ("Given", "When", "Then")
+_IDENTIFIER = re.compile(r"[^0-9a-zA-Z]+")
+_OUTLINE_PARAMETER = re.compile(r"<([^<>]+)>")
+
+
+@dataclass(frozen=True)
+class GeneratedArtifact:
+    """A rendered file produced by the generator."""
+
+    path: Path
+    content: str
+
+
+def scenario_hash(scenario: ScenarioPlan) -> str:
+    """Content hash of everything that affects a scenario's rendered output."""
+    return hashlib.blake2b(scenario.model_dump_json().encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _slug(value: str) -> str:
+    return _IDENTIFIER.sub("_", value).strip("_").lower() or "unnamed"
+
+
+def _feature_stem(feature: FeaturePlan) -> str:
+    return f"{feature.feature_number:02d}_{_slug(feature.feature_name)}"
+
+
+def _step_pattern(step_name: str) -> str:
+    """Turn step text into a ``parse`` format.
+
+    Literal braces are escaped and outline parameters (``<cpf>``) become
+    fields, since pytest-bdd substitutes example values before matching.
+    """
+    pattern = step_name.replace("{", "{{").replace("}", "}}")
+    return _OUTLINE_PARAMETER.sub(lambda match: f"{{{_slug(match.group(1))}}}", pattern)
+
+
+def _tags_line(tags: Iterable[str] | None, indent: str = "") -> str:
+    tags = [tag if tag.startswith("@") else f"@{tag}" for tag in tags or ()]
+    return f"{indent}{' '.join(tags)}\n" if tags else ""
+
+
+class TestArtifactGenerator:
+    """Renders feature plans into Gherkin feature files and step definitions."""
+
+    def __init__(
+        self,
+        templates: Mapping[str, str] | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Compile templates once.
+
+        Args:
+            templates: Optional overrides for ``DEFAULT_TEMPLATES`` entries.
+            cache_size: Entries kept in the rendered-scenario and written-file caches.
+        """
+        sources = {**DEFAULT_TEMPLATES, **(templates or {})}
+        self._templates = {name: Template(source) for name, source in sources.items()}
+        self._cache_size = cache_size
+        self._scenario_cache: OrderedDict[str, str] = OrderedDict()
+        self._written: OrderedDict[Path, bytes] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def render_feature(self, feature: FeaturePlan) -> str:
+        """Render a feature plan into Gherkin."""
+        buffer = [
+            self._templates["feature_header"].substitute(
+                tags=_tags_line(feature.feature_tags),
+                feature_name=feature.feature_name,
+            )
+        ]
+        for scenario in sorted(feature.scenarios, key=lambda item: item.scenario_number):
+            buffer.append(self._render_scenario_cached(scenario))
+        return "".join(buffer)
+
+    def render_step_definitions(self, feature: FeaturePlan) -> str:
+        """Render step-definition stubs, one per distinct step text.
+
+        The module binds ``../features/<stem>.feature`` (the layout written by
+        ``generate``) and registers each step under every keyword it is used
+        with in the feature. Text from the plan is only emitted as ``repr``
+        literals, so quotes or backslashes in names cannot break the module.
+        """
+        keywords: dict[str, list[str]] = {}
+        for scenario in sorted(feature.scenarios, key=lambda item: item.scenario_number):
+            steps = sorted(scenario.steps, key=lambda item: item.step_number)
+            for index, step in enumerate(steps):
+                used = keywords.setdefault(step.step_name, [])
+                keyword = self._step_keyword(index, len(steps))
+                if keyword not in used:
+                    used.append(keyword)
+
+        decorator_template = self._templates["step_decorator"]
+        step_template = self._templates["step_definition"]
+        buffer = [
+            self._templates["step_definitions_header"].substitute(
+                docstring=repr(f"Step definitions for feature: {feature.feature_name}."),
+                feature_path=repr(f"../features/{_feature_stem(feature)}.feature"),
+            )
+        ]
+        function_names: set[str] = set()
+        for step_name, used in keywords.items():
+            function_name = base_name = f"step_{_slug(step_name)}"
+            suffix = 2
+            while function_name in function_names:
+                function_name = f"{base_name}_{suffix}"
+                suffix += 1
+            function_names.add(function_name)
+            buffer.append(
+                step_template.substitute(
+                    decorators="".join(
+                        decorator_template.substitute(
+                            decorator=keyword.lower(), pattern=repr(_step_pattern(step_name))
+                        )
+                        for keyword in sorted(used, key=_STEP_KEYWORDS.index)
+                    ),
+                    function_name=function_name,
+                    docstring=repr(step_name),
+                    skip_reason=repr(f"Step not implemented: {step_name}"),
+                )
+            )
+        return "".join(buffer)
+
+    def generate(
+        self,
+        features: Iterable[FeaturePlan],
+        output_dir: str | Path,
+    ) -> list[GeneratedArtifact]:
+        """Render every feature into feature and step-definition artifacts."""
+        root = Path(output_dir)
+        artifacts: list[GeneratedArtifact] = []
+        for feature in sorted(features, key=lambda item: item.feature_number):
+            stem = _feature_stem(feature)
+            artifacts.append(
+                GeneratedArtifact(
+                    root / "features" / f"{stem}.feature", self.render_feature(feature)
+                )
+            )
+            artifacts.append(
+                GeneratedArtifact(
+                    root / "steps" / f"test_{stem}_steps.py", self.render_step_definitions(feature)
+                )
+            )
+        return artifacts
+
+    def write(self, artifacts: Iterable[GeneratedArtifact]) -> list[Path]:
+        """Write artifacts in bulk, skipping files whose content is unchanged.
+
+        Returns:
+            Paths that were actually written.
+        """
+        pending = [
+            (artifact, hashlib.blake2b(artifact.content.encode("utf-8"), digest_size=16).digest())
+            for artifact in artifacts
+        ]
+        pending = [
+            (artifact, digest) for artifact, digest in pending if self._changed(artifact, digest)
+        ]
+        for directory in {artifact.path.parent for artifact, _ in pending}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        written: list[Path] = []
+        for artifact, digest in pending:
+            artifact.path.write_text(artifact.content, encoding="utf-8")
+            self._remember(self._written, artifact.path, digest)
+            written.append(artifact.path)
+        logger.info("Wrote generated artifacts", extra={"written": len(written)})
+        return written
+
+    def _changed(self, artifact: GeneratedArtifact, digest: bytes) -> bool:
+        if not artifact.path.exists():
+            return True
+        known = self._written.get(artifact.path)
+        if known is None:
+            # Not written by this process (fresh worker or evicted): hash the file on disk.
+            known = hashlib.blake2b(artifact.path.read_bytes(), digest_size=16).digest()
+        if known != digest:
+            return True
+        self._remember(self._written, artifact.path, digest)
+        return False
+
+    def _remember(self, cache: OrderedDict, key: Hashable, value: object) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self._cache_size:
+            cache.popitem(last=False)
+
+    def _render_scenario_cached(self, scenario: ScenarioPlan) -> str:
+        key = scenario_hash(scenario)
+        rendered = self._scenario_cache.get(key)
+        if rendered is None:
+            self.cache_misses += 1
+            rendered = self._render_scenario(scenario)
+        else:
+            self.cache_hits += 1
+        self._remember(self._scenario_cache, key, rendered)
+        return rendered
+
+    def _render_scenario(self, scenario: ScenarioPlan) -> str:
+        step_template = self._templates["step"]
+        steps = sorted(scenario.steps, key=lambda item: item.step_number)
+        rendered_steps = "".join(
+            step_template.substitute(
+                keyword=self._step_keyword(index, len(steps)),
+                step_name=step.step_name,
+            )
+            for index, step in enumerate(steps)
+        )
+        tags = list(scenario.tags or ())
+        if scenario.type:
+            tags.append(scenario.type.lower())
+        if scenario.priority:
+            tags.append(f"priority_{scenario.priority.lower()}")
+        description = f"    {scenario.description.strip()}\n" if scenario.description else ""
+
+        return self._templates["scenario"].substitute(
+            tags=_tags_line(tags, indent="  "),
+            keyword="Scenario Outline" if scenario.outlines else "Scenario",
+            name=scenario.name,
+            description=description,
+            steps=rendered_steps,
+            examples=self._render_examples(scenario),
+        )
+
+    @staticmethod
+    def _render_examples(scenario: ScenarioPlan) -> str:
+        buffer: list[str] = []
+        for outline in scenario.outlines or ():
+            names = [header.name for header in outline.headers]
+            buffer.append("\n    Examples:\n")
+            buffer.append(f"      | {' | '.join(names)} |\n")
+            for row in outline.rows:
+                values = (str(row.data.get(name, "")).replace("|", "\\|") for name in names)
+                buffer.append(f"      | {' | '.join(values)} |\n")
+        return "".join(buffer)
+
+    @staticmethod
+    def _step_keyword(index: int, total: int) -> str:
+        if index == 0:
+            return _STEP_KEYWORDS[0]
+        if index == total - 1:
+            return _STEP_KEYWORDS[2]
+        return _STEP_KEYWORDS[1]
@@ -2,3 +2,62 @@
 
 TODO: Wire Pub/Sub subscriptions and publish result events.
 """
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from aegis_agents.shared.contracts import TestPlanningFailedEvent
+from aegis_agents.shared.messaging.interfaces import MessagePublisher
+from aegis_agents.shared.messaging.retry import FailureHandler
+from aegis_agents.shared.messaging.topics import Topics
+
+logger = logging.getLogger(__name__)
+
+# Published when the failed message carries no usable specification id.
+UNKNOWN_SPECIFICATION_ID = -1
+
+
+def _specification_id(message: dict[str, Any]) -> int:
+    try:
+        return int(message.get("specification_id"))
+    except (TypeError, ValueError):
+        return UNKNOWN_SPECIFICATION_ID
+
+
+def failure_reporter(publisher: MessagePublisher) -> FailureHandler:
+    """Build the callback that publishes an error event for messages given up on.
+
+    The event is built from whatever the message contains, so malformed
+    messages (the ones most likely to fail) are still reported.
+
+    Args:
+        publisher: Connected publisher used to emit the failure event.
+    """
+
+    async def report_failure(
+        message: dict[str, Any], correlation_id: str | None, error: BaseException
+    ) -> None:
+        payload = message if isinstance(message, dict) else {}
+        event = TestPlanningFailedEvent(
+            trace_id=str(payload.get("trace_id") or correlation_id or ""),
+            specification_id=_specification_id(payload),
+            error_type=type(error).__name__,
+            message=str(error) or repr(error),
+        )
+        logger.info(
+            "Publishing planning failure",
+            extra={
+                "correlation_id": correlation_id,
+                "specification_id": event.specification_id,
+                "error_type": event.error_type,
+            },
+        )
+        await publisher.publish(
+            Topics.TEST_GENERATION_PLANNING_FAILED,
+            event.model_dump(),
+            correlation_id=correlation_id,
+        )
+
+    return report_failure
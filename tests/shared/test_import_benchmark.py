@@ -0,0 +1,32 @@
+"""Tests guarding the import cost of shared modules."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from aegis_agents.shared import import_benchmark
+from aegis_agents.shared.import_benchmark import DEFAULT_TARGETS, measure_import
+
+SRC = Path(import_benchmark.__file__).resolve().parents[2]
+
+
+@pytest.fixture(autouse=True)
+def src_on_subprocess_path(monkeypatch):
+    # The probe runs in a fresh interpreter that does not inherit pytest's pythonpath.
+    paths = [str(SRC), *filter(None, [os.environ.get("PYTHONPATH")])]
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(paths))
+
+
+@pytest.mark.parametrize("module", sorted(DEFAULT_TARGETS))
+def test_module_does_not_eagerly_import_heavy_sdks(module):
+    result = measure_import(module, DEFAULT_TARGETS[module], runs=1)
+
+    assert result.forbidden_loaded == ()
+
+
+def test_forbidden_modules_are_detected():
+    result = measure_import("json", ("json", "json.decoder", "grpc"), runs=1)
+
+    assert result.forbidden_loaded == ("json", "json.decoder")
+    assert result.best_ms >= 0
@@ -0,0 +1,153 @@
+"""Tests for message recording and replay."""
+
+import asyncio
+import json
+
+import pytest
+
+from aegis_agents.shared.messaging.interfaces import MessagePublisher
+from aegis_agents.shared.messaging.replay import (
+    MessageRecorder,
+    MessageReplayer,
+    read_recording,
+    recorder_destination,
+)
+from aegis_agents.shared.messaging.topics import MessagingDestination, Topics
+
+
+class FakePublisher(MessagePublisher):
+    def __init__(self) -> None:
+        self.published: list[tuple[MessagingDestination, dict, str | None]] = []
+
+    async def connect(self) -> None:
+        return None
+
+    async def disconnect(self) -> None:
+        return None
+
+    async def publish(self, destination, message, correlation_id=None) -> None:
+        self.published.append((destination, message, correlation_id))
+
+
+def record(path, messages, **kwargs) -> MessageRecorder:
+    recorder = MessageRecorder(path, **kwargs)
+    for message, correlation_id in messages:
+        recorder.record(Topics.TEST_GENERATION_REQUESTED, message, correlation_id)
+    return recorder
+
+
+async def test_round_trip_masks_sensitive_fields(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    messages = [
+        ({"specification_id": 1, "customer": {"cpf": "123.456.789-09"}}, "corr-1"),
+        ({"specification_id": 2, "password": "secret"}, None),
+    ]
+    record(path, messages).close()
+
+    publisher = FakePublisher()
+    published = await MessageReplayer(publisher, speed=None).replay(path)
+
+    assert published == 2
+    [(destination, first, corr), (_, second, no_corr)] = publisher.published
+    assert destination == Topics.TEST_GENERATION_REQUESTED
+    assert (corr, no_corr) == ("corr-1", None)
+    assert first["specification_id"] == 1
+    assert first["customer"]["cpf"].startswith("masked:")
+    assert second["password"].startswith("masked:")
+
+
+async def test_tap_records_and_forwards(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    received: list[dict] = []
+
+    async def handler(message, correlation_id):
+        received.append(message)
+
+    recorder = MessageRecorder(path, mask=False)
+    await recorder.tap(Topics.TEST_GENERATION_REQUESTED, handler)({"a": 1}, "corr")
+    recorder.close()
+
+    assert received == [{"a": 1}]
+    assert [entry["message"] for entry in read_recording(path)] == [{"a": 1}]
+
+
+def test_offsets_start_at_each_sessions_first_message(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    first = record(path, [({"n": 0}, None)])
+    first.close()
+    second = MessageRecorder(path)
+    second.record(Topics.TEST_GENERATION_REQUESTED, {"n": 1}, None)
+    second.close()
+
+    entries = list(read_recording(path))
+
+    assert [entry["offset"] for entry in entries] == [0.0, 0.0]
+    assert entries[0]["session"] == first.session
+    assert entries[1]["session"] == second.session != first.session
+
+
+async def test_replay_restarts_timing_per_session(tmp_path, monkeypatch):
+    path = tmp_path / "traffic.jsonl"
+    lines = [
+        {"session": "a", "offset": 0.0, "message": {"n": 0}},
+        {"session": "a", "offset": 5.0, "message": {"n": 1}},
+        {"session": "b", "offset": 0.0, "message": {"n": 2}},
+        {"session": "b", "offset": 1.0, "message": {"n": 3}},
+    ]
+    path.write_text(
+        "".join(
+            json.dumps({**line, "destination": "test-generation-requested", "topic": "t"}) + "\n"
+            for line in lines
+        )
+    )
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay):
+        sleeps.append(round(delay, 1))
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    publisher = FakePublisher()
+    await MessageReplayer(publisher, speed=1.0).replay(path)
+
+    assert [message["n"] for _, message, _ in publisher.published] == [0, 1, 2, 3]
+    assert sleeps == [5.0, 1.0]
+
+
+def test_killed_recorder_leaves_a_readable_file(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    recorder = record(path, [({"n": n}, None) for n in range(5)], flush_every=2)
+
+    # Simulate a killed pod: the file is never closed, only periodically flushed.
+    killed = tmp_path / "killed.jsonl.gz"
+    killed.write_bytes(path.read_bytes())
+    recorder.close()
+
+    assert [entry["message"]["n"] for entry in read_recording(killed)] == [0, 1, 2, 3]
+
+    record(killed, [({"n": 99}, None)]).close()
+    assert [entry["message"]["n"] for entry in read_recording(killed)] == [0, 1, 2, 3, 99]
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    record(path, [({"n": 0}, None)]).close()
+    with path.open("a", encoding="utf-8") as recording:
+        recording.write('{"session": "x", "offs')
+
+    assert [entry["message"]["n"] for entry in read_recording(path)] == [0]
+
+    record(path, [({"n": 1}, None)]).close()
+    assert [entry["message"]["n"] for entry in read_recording(path)] == [0, 1]
+
+
+def test_recorder_uses_a_dedicated_subscription_on_the_same_topic():
+    agent = Topics.TEST_GENERATION_REQUESTED
+
+    default = recorder_destination(agent)
+    custom = recorder_destination(agent, "traffic-capture")
+
+    assert default.topic == custom.topic == agent.topic
+    assert default.subscription == f"{agent.subscription}-recorder"
+    assert custom.subscription == "traffic-capture"
+    with pytest.raises(ValueError):
+        recorder_destination(agent, agent.subscription)
@@ -0,0 +1,118 @@
+"""Tests for bounded, delayed message retries."""
+
+import asyncio
+
+import pytest
+
+from aegis_agents.shared.messaging.retry import NonRetryableError, RetryingDelivery, RetryPolicy
+
+
+class FakeMessage:
+    def __init__(self, message_id: str = "m-1", delivery_attempt: int | None = None) -> None:
+        self.message_id = message_id
+        self.delivery_attempt = delivery_attempt
+        self.settled: list[str] = []
+
+    def ack(self) -> None:
+        self.settled.append("ack")
+
+    def nack(self) -> None:
+        self.settled.append("nack")
+
+
+class Harness:
+    def __init__(self, policy: RetryPolicy) -> None:
+        self.sleeps: list[float] = []
+        self.failures: list[tuple[dict, str | None, BaseException]] = []
+        self.delivery = RetryingDelivery(policy, on_failure=self.on_failure, sleep=self.sleep)
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+
+    async def on_failure(self, body, correlation_id, error) -> None:
+        self.failures.append((body, correlation_id, error))
+
+
+async def failing(body, correlation_id):
+    raise RuntimeError("boom")
+
+
+async def test_success_acks_without_backoff():
+    harness = Harness(RetryPolicy())
+    message = FakeMessage()
+
+    async def ok(body, correlation_id):
+        return None
+
+    await harness.delivery.deliver(message, ok, {"a": 1}, "corr")
+
+    assert message.settled == ["ack"]
+    assert harness.sleeps == []
+
+
+async def test_failures_back_off_then_give_up_and_report():
+    harness = Harness(RetryPolicy(max_attempts=4, initial_backoff=1.0, max_backoff=3.0))
+    settled: list[str] = []
+
+    for _ in range(4):
+        message = FakeMessage("m-1")
+        await harness.delivery.deliver(message, failing, {"a": 1}, "corr")
+        settled.extend(message.settled)
+
+    assert settled == ["nack", "nack", "nack", "ack"]
+    assert harness.sleeps == [1.0, 2.0, 3.0]
+    [(body, correlation_id, error)] = harness.failures
+    assert (body, correlation_id, str(error)) == ({"a": 1}, "corr", "boom")
+
+
+async def test_pubsub_delivery_attempt_takes_precedence():
+    harness = Harness(RetryPolicy(max_attempts=5))
+    message = FakeMessage(delivery_attempt=5)
+
+    await harness.delivery.deliver(message, failing, {}, None)
+
+    assert message.settled == ["ack"]
+    assert len(harness.failures) == 1
+
+
+async def test_non_retryable_errors_are_acked_immediately():
+    harness = Harness(RetryPolicy())
+    message = FakeMessage()
+
+    async def invalid(body, correlation_id):
+        raise NonRetryableError("missing specification_id")
+
+    await harness.delivery.deliver(message, invalid, {}, "corr")
+
+    assert message.settled == ["ack"]
+    assert harness.sleeps == []
+    assert isinstance(harness.failures[0][2], NonRetryableError)
+
+
+async def test_failure_reporter_errors_are_contained():
+    async def broken_reporter(body, correlation_id, error):
+        raise RuntimeError("publish failed")
+
+    delivery = RetryingDelivery(RetryPolicy(max_attempts=1), on_failure=broken_reporter)
+    message = FakeMessage()
+
+    await delivery.deliver(message, failing, {}, None)
+
+    assert message.settled == ["ack"]
+
+
+async def test_cancellation_nacks_and_propagates():
+    message = FakeMessage()
+    started = asyncio.Event()
+
+    async def slow(body, correlation_id):
+        started.set()
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(RetryingDelivery().deliver(message, slow, {}, None))
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert message.settled == ["nack"]
@@ -0,0 +1,220 @@
+"""Tests for fair-share scheduling between tenants."""
+
+import asyncio
+
+import pytest
+
+from aegis_agents.shared.messaging.retry import RetryingDelivery, RetryPolicy
+from aegis_agents.shared.messaging.scheduling import (
+    FairShareScheduler,
+    SchedulerOverloadedError,
+)
+
+
+def message(tenant: str, number: int = 0, **extra) -> dict:
+    return {"test_project": {"id": tenant}, "n": number, **extra}
+
+
+class Gate:
+    """Handler that records start order and blocks until released."""
+
+    def __init__(self) -> None:
+        self.started: list[tuple[str, int]] = []
+        self.running: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.release = asyncio.Event()
+
+    async def __call__(self, body: dict, correlation_id: str | None) -> None:
+        tenant = body["test_project"]["id"]
+        self.started.append((tenant, body["n"]))
+        self.running[tenant] = self.running.get(tenant, 0) + 1
+        self.peak[tenant] = max(self.peak.get(tenant, 0), self.running[tenant])
+        try:
+            await self.release.wait()
+        finally:
+            self.running[tenant] -= 1
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def run_behind_blocker(scheduler: FairShareScheduler, gate: Gate, messages: list[dict]):
+    blocker = asyncio.create_task(scheduler.run(gate, message("blocker"), None))
+    await settle()
+    tasks = [asyncio.create_task(scheduler.run(gate, body, None)) for body in messages]
+    await settle()
+    gate.release.set()
+    await asyncio.gather(blocker, *tasks)
+    return [started for started in gate.started if started[0] != "blocker"]
+
+
+async def test_tenants_are_interleaved_fairly():
+    scheduler = FairShareScheduler(max_concurrency=1, tenant_concurrency=None)
+    messages = [message("big", n) for n in range(4)] + [message("small", n) for n in range(2)]
+
+    order = await run_behind_blocker(scheduler, Gate(), messages)
+
+    assert [tenant for tenant, _ in order] == ["big", "small", "big", "small", "big", "big"]
+    assert [n for tenant, n in order if tenant == "big"] == [0, 1, 2, 3]
+
+
+async def test_weights_give_a_larger_share():
+    scheduler = FairShareScheduler(
+        max_concurrency=1, tenant_concurrency=None, tenant_weights={"gold": 2.0}
+    )
+    messages = [message("gold", n) for n in range(4)] + [message("basic", n) for n in range(2)]
+
+    order = await run_behind_blocker(scheduler, Gate(), messages)
+
+    assert [tenant for tenant, _ in order] == ["gold", "gold", "basic", "gold", "gold", "basic"]
+
+
+async def test_high_priority_runs_first():
+    scheduler = FairShareScheduler(max_concurrency=1, tenant_concurrency=None)
+    messages = [message("a", n) for n in range(3)]
+    messages.append(message("b", 9, approve_before_generation=False))
+
+    order = await run_behind_blocker(scheduler, Gate(), messages)
+
+    assert order[0] == ("b", 9)
+
+
+async def test_tenant_concurrency_is_capped():
+    scheduler = FairShareScheduler(max_concurrency=10, tenant_concurrency=2)
+    gate = Gate()
+
+    tasks = [asyncio.create_task(scheduler.run(gate, message("a", n), None)) for n in range(6)]
+    tasks.append(asyncio.create_task(scheduler.run(gate, message("b"), None)))
+    await settle()
+    assert gate.running == {"a": 2, "b": 1}
+    assert scheduler.pending == 4
+
+    gate.release.set()
+    await asyncio.gather(*tasks)
+    assert gate.peak == {"a": 2, "b": 1}
+    assert (scheduler.pending, scheduler.running) == (0, 0)
+
+
+async def test_full_backlog_rejects_only_that_tenant():
+    scheduler = FairShareScheduler(max_concurrency=1, tenant_max_pending=2)
+    gate = Gate()
+    blocker = asyncio.create_task(scheduler.run(gate, message("blocker"), None))
+    await settle()
+    queued = [asyncio.create_task(scheduler.run(gate, message("a", n), None)) for n in range(2)]
+    await settle()
+
+    with pytest.raises(SchedulerOverloadedError):
+        await scheduler.run(gate, message("a", 2), None)
+    other = asyncio.create_task(scheduler.run(gate, message("b"), None))
+    await settle()
+    assert scheduler.pending == 3
+
+    gate.release.set()
+    await asyncio.gather(blocker, *queued, other)
+    assert ("a", 2) not in gate.started
+
+
+class Leased:
+    """Leased Pub/Sub message that records how it was settled."""
+
+    delivery_attempt = None
+
+    def __init__(self, message_id: str = "m-1") -> None:
+        self.message_id = message_id
+        self.settled: list[str] = []
+
+    def ack(self) -> None:
+        self.settled.append("ack")
+
+    def nack(self) -> None:
+        self.settled.append("nack")
+
+
+class Harness:
+    """Delivers messages through a scheduler, recording sleeps and failures."""
+
+    def __init__(self, scheduler: FairShareScheduler, gate: Gate) -> None:
+        self.sleeps: list[float] = []
+        self.failures: list[BaseException] = []
+        self.delivery = RetryingDelivery(
+            RetryPolicy(max_attempts=1), on_failure=self.on_failure, sleep=self.sleep
+        )
+        self.handler = scheduler.wrap(gate)
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+
+    async def on_failure(self, body, correlation_id, error) -> None:
+        self.failures.append(error)
+
+    def deliver(self, leased: Leased, body: dict) -> asyncio.Task:
+        return asyncio.create_task(self.delivery.deliver(leased, self.handler, body, None))
+
+
+async def test_backlog_limit_keeps_a_flooding_tenant_within_the_lease_window():
+    # 1000 leased messages from one tenant; only pending + running may stay leased.
+    scheduler = FairShareScheduler(
+        max_concurrency=16, tenant_concurrency=4, tenant_max_pending=100
+    )
+    gate = Gate()
+    harness = Harness(scheduler, gate)
+    blocker = harness.deliver(Leased("blocker"), message("blocker"))
+    await settle()
+
+    flood = [Leased(f"big-{n}") for n in range(1000)]
+    tasks = [harness.deliver(leased, message("big", n)) for n, leased in enumerate(flood)]
+    await settle()
+
+    still_leased = [leased for leased in flood if not leased.settled]
+    assert (scheduler.pending, scheduler.running) == (100, 5)
+    assert len(still_leased) == 104
+    assert all(leased.settled == ["nack"] for leased in flood if leased not in still_leased)
+    assert harness.sleeps == []
+
+    small = harness.deliver(Leased("small"), message("small"))
+    gate.release.set()
+    await asyncio.gather(blocker, small, *tasks)
+    assert gate.started.index(("small", 0)) < 8
+    assert harness.failures == []
+
+
+async def test_overload_is_nacked_at_once_without_using_up_attempts():
+    scheduler = FairShareScheduler(max_concurrency=1, tenant_max_pending=1)
+    gate = Gate()
+    harness = Harness(scheduler, gate)
+    blocker = harness.deliver(Leased("blocker"), message("blocker"))
+    await settle()
+    queued = harness.deliver(Leased("queued"), message("a"))
+    await settle()
+
+    for _ in range(3):
+        leased = Leased()
+        await harness.delivery.deliver(leased, harness.handler, message("a"), None)
+        assert leased.settled == ["nack"]
+    gate.release.set()
+    await asyncio.gather(blocker, queued)
+
+    assert harness.sleeps == []
+    assert harness.failures == []
+
+
+async def test_cancelled_waiter_is_withdrawn():
+    scheduler = FairShareScheduler(max_concurrency=1)
+    gate = Gate()
+    blocker = asyncio.create_task(scheduler.run(gate, message("blocker"), None))
+    await settle()
+    waiting = asyncio.create_task(scheduler.run(gate, message("a", 1), None))
+    after = asyncio.create_task(scheduler.run(gate, message("a", 2), None))
+    await settle()
+    assert scheduler.pending == 2
+
+    waiting.cancel()
+    await settle()
+    assert scheduler.pending == 1
+
+    gate.release.set()
+    await asyncio.gather(blocker, after)
+    assert ("a", 1) not in gate.started
+    assert (scheduler.pending, scheduler.running) == (0, 0)
@@ -0,0 +1,186 @@
+"""Tests for the JSON Schema test-data synthesizer."""
+
+import pytest
+
+from aegis_agents.shared.contracts import ApiCallSpec, ScenarioOutlineHeader
+from aegis_agents.shared.testdata import (
+    SchemaSynthesisError,
+    compile_schema,
+    synthesize_outline_rows,
+    synthesize_request_bodies,
+)
+
+CUSTOMER = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 2, "maxLength": 10},
+        "age": {"type": "integer", "minimum": 18, "maximum": 120},
+        "email": {"type": "string", "format": "email"},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+    },
+    "required": ["name", "age"],
+}
+
+
+def cpf_is_valid(cpf: str) -> bool:
+    digits = [int(char) for char in cpf if char.isdigit()]
+    for length in (9, 10):
+        total = sum(d * w for d, w in zip(digits, range(length + 1, 1, -1)))
+        if (total * 10) % 11 % 10 != digits[length]:
+            return False
+    return True
+
+
+def test_generation_is_deterministic_per_seed():
+    compiled = compile_schema(CUSTOMER)
+
+    assert compiled.generate("valid", 5, seed=7) == compiled.generate("valid", 5, seed=7)
+    assert compiled.generate("valid", 5, seed=7) != compiled.generate("valid", 5, seed=8)
+    assert compile_schema(dict(reversed(CUSTOMER.items()))) is compiled
+
+
+def test_valid_payloads_respect_constraints():
+    for payload in compile_schema(CUSTOMER).generate("valid", 50, seed=1):
+        assert 2 <= len(payload["name"]) <= 10
+        assert 18 <= payload["age"] <= 120
+        assert len(payload.get("tags", [])) <= 2
+
+
+def test_invalid_variant_covers_every_case():
+    compiled = compile_schema(CUSTOMER)
+    invalid = compiled.generate("invalid", compiled.case_count("invalid"), seed=1)
+
+    objects = [payload for payload in invalid if isinstance(payload, dict)]
+    assert any("name" not in payload for payload in objects)
+    assert any(payload.get("age") == 17 for payload in objects)
+    assert any(payload.get("age") == 121 for payload in objects)
+    assert [] in invalid
+
+
+@pytest.mark.parametrize(
+    ("schema", "boundary", "outside"),
+    [
+        ({"type": "integer", "minimum": 0, "exclusiveMinimum": True, "maximum": 10}, [1, 10], 0),
+        ({"type": "integer", "minimum": 0, "exclusiveMinimum": False, "maximum": 10}, [0, 10], -1),
+        ({"type": "integer", "minimum": 0, "maximum": 10, "exclusiveMaximum": True}, [0, 9], 10),
+        ({"type": "integer", "exclusiveMinimum": 0, "exclusiveMaximum": 5}, [1, 4], 0),
+        ({"type": "integer", "minimum": 3, "exclusiveMinimum": 0, "maximum": 5}, [3, 5], 2),
+    ],
+)
+def test_exclusive_bounds(schema, boundary, outside):
+    compiled = compile_schema(schema)
+
+    assert compiled.generate("boundary", 2) == boundary
+    invalid = compiled.generate("invalid", compiled.case_count("invalid"))
+    assert outside in invalid
+    assert not set(boundary) & {value for value in invalid if isinstance(value, int)}
+
+
+def test_local_refs_are_resolved():
+    schema = {
+        "type": "object",
+        "properties": {"document": {"$ref": "#/components/schemas/Document"}},
+        "required": ["document"],
+        "components": {"schemas": {"Document": {"type": "string", "format": "cpf"}}},
+    }
+
+    payloads = compile_schema(schema).generate("valid", 10, seed=3)
+
+    assert all(cpf_is_valid(payload["document"]) for payload in payloads)
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"$ref": "#/$defs/Missing"},
+        {"$ref": "https://example.com/customer.json"},
+        {
+            "$ref": "#/$defs/Node",
+            "$defs": {"Node": {"properties": {"next": {"$ref": "#/$defs/Node"}}}},
+        },
+        {"pattern": "^[a-z]+$"},
+        {"type": "string", "pattern": "^[0-9]{5}-[0-9]{3}$"},
+        {"type": "string", "format": "phone"},
+        {"type": "integer", "multipleOf": 5},
+        {"type": "array", "items": {"type": "integer"}, "uniqueItems": True},
+        {"type": "integer", "minimum": 1.2, "maximum": 1.8},
+        {"type": "object", "required": ["id"], "additionalProperties": False},
+        {"type": "date"},
+    ],
+)
+def test_unsupported_schemas_raise(schema):
+    with pytest.raises(SchemaSynthesisError):
+        compile_schema(schema)
+
+
+@pytest.mark.parametrize(
+    ("schema", "boundary", "outside"),
+    [
+        ({"type": "integer", "minimum": 1.5, "maximum": 3.5}, [2, 3], [1, 4]),
+        ({"type": "integer", "exclusiveMinimum": 1.5, "exclusiveMaximum": 4.5}, [2, 4], [1, 5]),
+        ({"type": "integer", "minimum": -2.5, "maximum": -0.5}, [-2, -1], [-3, 0]),
+    ],
+)
+def test_fractional_integer_bounds_are_rounded_inwards(schema, boundary, outside):
+    compiled = compile_schema(schema)
+
+    assert compiled.generate("boundary", 2) == boundary
+    assert all(boundary[0] <= value <= boundary[1] for value in compiled.generate("valid", 50))
+    invalid = compiled.generate("invalid", compiled.case_count("invalid"))
+    assert all(value in invalid for value in outside)
+
+
+def test_required_properties_without_a_schema_are_generated():
+    schema = {
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+        "required": ["name", "id", "score"],
+        "additionalProperties": {"type": "integer", "minimum": 1, "maximum": 9},
+    }
+    compiled = compile_schema(schema)
+
+    for payload in compiled.generate("valid", 20, seed=4):
+        assert {"name", "id", "score"} <= set(payload)
+        assert 1 <= payload["id"] <= 9
+    invalid = compiled.generate("invalid", compiled.case_count("invalid"))
+    assert any(isinstance(payload, dict) and "id" not in payload for payload in invalid)
+    untyped = compile_schema({"type": "object", "required": ["id"]})
+    assert all("id" in payload for payload in untyped.generate("valid", 5))
+
+
+def test_cpf_format_variants():
+    compiled = compile_schema({"type": "string", "format": "cpf"})
+
+    assert all(cpf_is_valid(cpf) for cpf in compiled.generate("valid", 20, seed=5))
+    assert not cpf_is_valid(compiled.generate("invalid", 1, seed=5)[0])
+
+
+def test_request_bodies_follow_scenario_type():
+    api_call = ApiCallSpec(id=1, name="create", method="POST", path="/c", request_schema=CUSTOMER)
+
+    positive = synthesize_request_bodies(api_call, "POSITIVE", count=3)
+    negative = synthesize_request_bodies(api_call, "NEGATIVE", count=3)
+
+    assert positive == compile_schema(CUSTOMER).generate("valid", 3)
+    assert negative == compile_schema(CUSTOMER).generate("invalid", 3)
+    with pytest.raises(SchemaSynthesisError):
+        synthesize_request_bodies(ApiCallSpec(id=2, name="list", method="GET", path="/c"))
+
+
+def test_outline_rows_use_header_types():
+    headers = [
+        ScenarioOutlineHeader(name="quantity", type="int"),
+        ScenarioOutlineHeader(name="document", type="cpf"),
+    ]
+
+    rows = synthesize_outline_rows(headers, count=4, seed=2)
+
+    assert len(rows) == 4
+    for row in rows:
+        assert isinstance(row.data["quantity"], int)
+        assert cpf_is_valid(row.data["document"])
+
+
+def test_outline_rows_reject_unknown_header_types():
+    with pytest.raises(SchemaSynthesisError):
+        synthesize_outline_rows([ScenarioOutlineHeader(name="price", type="money")])
@@ -0,0 +1,101 @@
+"""Tests for the append-only execution history store."""
+
+from aegis_agents.shared.contracts import (
+    FeaturePlan,
+    ScenarioOutline,
+    ScenarioOutlineHeader,
+    ScenarioOutlineRow,
+    ScenarioPlan,
+)
+from aegis_agents.test_analyzer.contracts import ScenarioResult
+from aegis_agents.test_analyzer.history import ExecutionHistoryStore
+
+
+def result(status: str, scenario_number: int = 1, outline_row=None) -> ScenarioResult:
+    return ScenarioResult(
+        specification_id=1,
+        feature_number=1,
+        scenario_number=scenario_number,
+        status=status,
+        outline_row=outline_row,
+    )
+
+
+def test_failure_after_pass_streak_is_a_regression(tmp_path):
+    store = ExecutionHistoryStore(tmp_path / "history.jsonl", regression_min_pass_streak=3)
+
+    verdicts = [store.record(result(status)) for status in ["passed"] * 3 + ["failed"]]
+
+    assert not any(verdict.regression for verdict in verdicts[:3])
+    assert verdicts[-1].regression
+    assert not verdicts[-1].flaky
+    assert verdicts[-1].failure_rate == 0.25
+
+
+def test_alternating_outcomes_are_flaky(tmp_path):
+    store = ExecutionHistoryStore(tmp_path / "history.jsonl", flaky_min_flips=2)
+
+    verdicts = store.record_many([result(s) for s in ["passed", "failed", "passed"]])
+
+    assert [verdict.flaky for verdict in verdicts] == [False, False, True]
+
+
+def test_skipped_results_do_not_count_as_passes(tmp_path):
+    store = ExecutionHistoryStore(tmp_path / "history.jsonl", regression_min_pass_streak=2)
+
+    store.record_many([result(s) for s in ["failed", "skipped", "failed"]])
+    verdict = store.verdict((1, 1, 1, ""))
+    assert verdict.runs == 2
+    assert not verdict.flaky
+
+    store.record(result("passed", scenario_number=2))
+    store.record(result("skipped", scenario_number=2))
+    assert not store.record(result("failed", scenario_number=2)).regression
+
+
+def test_history_survives_reopen_torn_lines_and_compaction(tmp_path):
+    path = tmp_path / "history.jsonl"
+    store = ExecutionHistoryStore(path, window=3)
+    store.record_many([result(s) for s in ["passed", "failed", "passed", "failed", "failed"]])
+    with path.open("a", encoding="utf-8") as log:
+        log.write('[1,1,1,"",')
+
+    reopened = ExecutionHistoryStore(path, window=3)
+    assert reopened.verdict((1, 1, 1, "")).runs == 5
+    reopened.record(result("passed"))
+
+    reopened.compact()
+    compacted = ExecutionHistoryStore(path, window=3)
+    verdict = compacted.verdict((1, 1, 1, ""))
+    assert verdict.runs == 6
+    assert verdict.failure_rate == 2 / 3
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_select_for_rerun_keeps_failed_and_flaky_rows_only(tmp_path):
+    store = ExecutionHistoryStore(tmp_path / "history.jsonl")
+    store.record(result("failed", scenario_number=1))
+    store.record(result("passed", scenario_number=2, outline_row={"cpf": "a"}))
+    store.record(result("failed", scenario_number=2, outline_row={"cpf": "b"}))
+    store.record(result("passed", scenario_number=3))
+    outline = ScenarioOutline(
+        headers=[ScenarioOutlineHeader(name="cpf")],
+        rows=[ScenarioOutlineRow(data={"cpf": "a"}), ScenarioOutlineRow(data={"cpf": "b"})],
+    )
+    plan = [
+        FeaturePlan(
+            feature_number=1,
+            feature_name="Customers",
+            scenarios=[
+                ScenarioPlan(scenario_number=1, name="one", steps=[]),
+                ScenarioPlan(scenario_number=2, name="two", steps=[], outlines=[outline]),
+                ScenarioPlan(scenario_number=3, name="three", steps=[]),
+            ],
+        )
+    ]
+
+    selected = store.select_for_rerun(1, plan)
+
+    scenarios = selected[0].scenarios
+    assert [scenario.scenario_number for scenario in scenarios] == [1, 2]
+    assert scenarios[1].outlines[0].rows == [ScenarioOutlineRow(data={"cpf": "b"})]
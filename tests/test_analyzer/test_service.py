@@ -0,0 +1,142 @@
+"""Tests for streaming result ingestion and incremental aggregation."""
+
+import io
+import json
+
+import pytest
+
+from aegis_agents.test_analyzer.service import (
+    ResultAggregator,
+    iter_jsonl_results,
+    iter_junit_results,
+    normalize_error_signature,
+)
+
+JUNIT_REPORT = b"""<testsuites>
+  <testsuite name="customers">
+    <properties>
+      <property name="specification_id" value="7"/>
+      <property name="feature_number" value="1"/>
+    </properties>
+    <testcase name="create" time="0.012">
+      <properties>
+        <property name="scenario_number" value="1"/>
+        <property name="endpoint" value="POST /customers"/>
+      </properties>
+    </testcase>
+    <testcase name="duplicate" time="1,234.5">
+      <properties>
+        <property name="scenario_number" value="2"/>
+        <property name="endpoint" value="POST /customers"/>
+      </properties>
+      <failure message="Expected 201 but got 409 for id 98765"/>
+    </testcase>
+    <testcase name="broken-time" time="abc">
+      <properties><property name="scenario_number" value="3"/></properties>
+    </testcase>
+    <testcase name="missing-ids"><skipped/></testcase>
+    <testcase name="last" time="0.3">
+      <properties><property name="scenario_number" value="4"/></properties>
+      <skipped message="not ready"/>
+    </testcase>
+  </testsuite>
+</testsuites>"""
+
+
+def jsonl_line(**overrides) -> str:
+    result = {
+        "specification_id": 1,
+        "feature_number": 1,
+        "scenario_number": 1,
+        "status": "passed",
+    }
+    result.update(overrides)
+    return json.dumps(result) + "\n"
+
+
+def test_jsonl_parsing_skips_blank_and_invalid_lines():
+    lines = [jsonl_line(), "\n", "not json\n", jsonl_line(status="failed", error_message="x")]
+
+    results = list(iter_jsonl_results(lines))
+
+    assert [result.status for result in results] == ["passed", "failed"]
+
+
+def test_junit_parsing_inherits_suite_properties_and_survives_bad_cases():
+    results = list(iter_junit_results(io.BytesIO(JUNIT_REPORT)))
+
+    assert [(r.scenario_number, r.status) for r in results] == [
+        (1, "passed"),
+        (2, "failed"),
+        (4, "skipped"),
+    ]
+    assert all(r.specification_id == 7 and r.feature_number == 1 for r in results)
+    assert results[1].duration_ms == 1_234_500
+    assert results[1].error_message == "Expected 201 but got 409 for id 98765"
+
+
+def test_signature_keeps_http_status_codes():
+    assert normalize_error_signature("expected status 200 but got 500 for id 12345") == (
+        "expected status 200 but got 500 for id <num>"
+    )
+    assert normalize_error_signature("HTTP/1.1 503 after 3 retries") == (
+        "HTTP/1.1 503 after <num> retries"
+    )
+    assert normalize_error_signature("status code: 500 for id 1") != (
+        normalize_error_signature("status code: 404 for id 1")
+    )
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        ("expected 250 items got 251", "expected 120 items got 121"),
+        ("order 404 not found", "order 405 not found"),
+        ("timeout after 5000ms", "timeout after 5123ms"),
+        ("payload of 2048bytes exceeds 1.5s budget", "payload of 300bytes exceeds 2s budget"),
+    ],
+)
+def test_signature_normalizes_numbers_outside_a_status_context(first, second):
+    assert normalize_error_signature(first) == normalize_error_signature(second)
+
+
+def test_aggregator_keys_by_specification_and_clusters_failures():
+    aggregator = ResultAggregator()
+    summaries = []
+    lines = [
+        jsonl_line(specification_id=1, endpoint="GET /a", duration_ms=15),
+        jsonl_line(specification_id=2, status="failed", error_message="got status 500 at id 1"),
+        jsonl_line(specification_id=2, status="failed", error_message="got status 500 at id 2"),
+        jsonl_line(specification_id=2, status="failed", error_message="got status 404 at id 3"),
+    ]
+
+    summary = aggregator.consume(iter_jsonl_results(lines), summaries.append, progress_every=2)
+
+    assert len(summaries) == 2
+    assert summaries[0].results_processed == 2
+    assert summary.totals.total == 4
+    assert summary.features["1.1"].passed == 1
+    assert summary.features["2.1"].failed == 3
+    assert summary.scenarios["2.1.1"].failed == 3
+    assert summary.latency["GET /a"].count == 1
+    assert summary.latency["GET /a"].p50_ms == 15
+    assert [(c.signature, c.count) for c in summary.failure_clusters] == [
+        ("got status 500 at id <num>", 2),
+        ("got status 404 at id <num>", 1),
+    ]
+
+
+def test_aggregator_caps_failure_clusters():
+    aggregator = ResultAggregator(max_clusters=1)
+    lines = [
+        jsonl_line(status="failed", error_message="first kind"),
+        jsonl_line(status="failed", error_message="second kind"),
+        jsonl_line(status="error", error_message="third kind"),
+    ]
+
+    summary = aggregator.consume(iter_jsonl_results(lines))
+
+    assert {c.signature: c.count for c in summary.failure_clusters} == {
+        "first kind": 1,
+        "<other>": 2,
+    }
@@ -0,0 +1 @@
+"""Tests for the test executor agent."""
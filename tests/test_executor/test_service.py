@@ -0,0 +1,129 @@
+"""Tests for the executor setup DAG scheduler."""
+
+import asyncio
+
+import pytest
+
+from aegis_agents.shared.contracts import ApiCallRef
+from aegis_agents.test_executor.contracts import ScenarioSetupRequirement
+from aegis_agents.test_executor.service import (
+    ScenarioSetupScheduler,
+    SetupCallError,
+    SetupDependencyError,
+    SetupDependencyGraph,
+)
+
+CREATE_CUSTOMER = ApiCallRef(id=1, name="create-customer", method="POST", path="/customers")
+GET_CUSTOMER = ApiCallRef(id=2, name="get-customer", method="GET", path="/customers/{id}")
+GET_CUSTOMER_ALIAS = ApiCallRef(
+    id=3, name="get-customer", method="get", path="/customers/:customerId"
+)
+CREATE_ORDER = ApiCallRef(id=4, name="create-order", method="POST", path="/orders")
+
+
+def scenario(number: int, *call_ids: int) -> ScenarioSetupRequirement:
+    return ScenarioSetupRequirement(
+        feature_number=1, scenario_number=number, setup_call_ids=list(call_ids)
+    )
+
+
+class RecordingRunner:
+    def __init__(self, failing: set[int] | None = None) -> None:
+        self.calls: list[int] = []
+        self.failing = failing or set()
+
+    async def __call__(self, call, prerequisites):
+        self.calls.append(call.id)
+        await asyncio.sleep(0)
+        if call.id in self.failing:
+            raise RuntimeError(f"boom {call.id}")
+        return {"id": call.id, "prerequisites": dict(prerequisites)}
+
+
+async def return_fixtures(requirement, fixtures):
+    return fixtures
+
+
+def test_graph_orders_create_before_read_and_deduplicates_templates():
+    graph = SetupDependencyGraph([GET_CUSTOMER, CREATE_CUSTOMER, GET_CUSTOMER_ALIAS, CREATE_ORDER])
+
+    order = graph.order
+    assert len(order) == 3
+    create, read = graph.key_for(1), graph.key_for(2)
+    assert create == ("POST", "/customers", "create-customer")
+    assert read == ("GET", "/customers/{}", "get-customer")
+    assert order.index(create) < order.index(read)
+    assert graph.key_for(2) == graph.key_for(3)
+
+
+def test_graph_keeps_different_calls_on_the_same_endpoint():
+    create_vip = ApiCallRef(id=5, name="create-vip-customer", method="POST", path="/customers")
+    fetch = ApiCallRef(id=6, name="fetch-customer", method="GET", path="/customers/{id}")
+
+    graph = SetupDependencyGraph([CREATE_CUSTOMER, create_vip, GET_CUSTOMER, fetch])
+
+    assert len(graph.order) == 4
+    assert graph.key_for(1) != graph.key_for(5)
+    assert graph.key_for(2) != graph.key_for(6)
+    assert graph.dependencies(graph.key_for(2)) == {graph.key_for(1), graph.key_for(5)}
+
+
+def test_custom_method_paths_are_not_treated_as_parameters():
+    search = ApiCallRef(id=5, name="search", method="POST", path="/customers:search")
+    activate = ApiCallRef(id=6, name="activate", method="POST", path="/customers/{id}:activate")
+    graph = SetupDependencyGraph([CREATE_CUSTOMER, search, activate])
+
+    assert graph.key_for(5)[1] == "/customers:search"
+    assert graph.key_for(6)[1] == "/customers/{}:activate"
+    assert graph.dependencies(graph.key_for(5)) == frozenset()
+    assert graph.dependencies(graph.key_for(6)) == {graph.key_for(1)}
+
+
+def test_graph_rejects_cycles_and_unknown_ids():
+    with pytest.raises(SetupDependencyError):
+        SetupDependencyGraph([CREATE_CUSTOMER, GET_CUSTOMER], explicit_dependencies={1: [2]})
+    with pytest.raises(SetupDependencyError):
+        SetupDependencyGraph([CREATE_CUSTOMER]).key_for(99)
+
+
+async def test_shared_setup_runs_once_and_passes_prerequisite_results():
+    graph = SetupDependencyGraph([CREATE_CUSTOMER, GET_CUSTOMER, GET_CUSTOMER_ALIAS, CREATE_ORDER])
+    runner = RecordingRunner()
+    scheduler = ScenarioSetupScheduler(graph, runner)
+
+    results = await scheduler.run_scenarios(
+        [scenario(1, 2), scenario(2, 3, 4), scenario(3, 1)], return_fixtures
+    )
+
+    assert sorted(runner.calls) == [1, 2, 4]
+    assert runner.calls.index(1) < runner.calls.index(2)
+    assert results[0][2]["prerequisites"] == {1: {"id": 1, "prerequisites": {}}}
+    assert results[1][3] is results[0][2]
+    assert results[2][1]["id"] == 1
+
+
+async def test_failed_setup_only_fails_dependent_scenarios():
+    graph = SetupDependencyGraph([CREATE_CUSTOMER, GET_CUSTOMER, CREATE_ORDER])
+    scheduler = ScenarioSetupScheduler(graph, RecordingRunner(failing={4}))
+
+    results = await scheduler.run_scenarios(
+        [scenario(1, 4), scenario(2, 2), scenario(3, 2, 4)], return_fixtures
+    )
+
+    assert isinstance(results[0], SetupCallError)
+    assert results[0].call.id == 4
+    assert results[1][2]["id"] == 2
+    assert isinstance(results[2], SetupCallError)
+
+
+async def test_failed_prerequisite_propagates_to_dependents():
+    graph = SetupDependencyGraph([CREATE_CUSTOMER, GET_CUSTOMER, CREATE_ORDER])
+    runner = RecordingRunner(failing={1})
+    scheduler = ScenarioSetupScheduler(graph, runner)
+
+    results = await scheduler.run_scenarios([scenario(1, 2), scenario(2, 4)], return_fixtures)
+
+    assert isinstance(results[0], SetupCallError)
+    assert results[0].call.id == 1
+    assert 2 not in runner.calls
+    assert results[1][4]["id"] == 4
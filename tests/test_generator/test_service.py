@@ -0,0 +1,201 @@
+"""Tests for the test artifact generator."""
+
+import ast
+import subprocess
+import sys
+
+import pytest
+
+from aegis_agents.shared.contracts import (
+    FeaturePlan,
+    ScenarioOutline,
+    ScenarioOutlineHeader,
+    ScenarioOutlineRow,
+    ScenarioPlan,
+    StepPlan,
+)
+from aegis_agents.test_generator import service
+
+
+def scenario(number: int, *steps: str, name: str = "Scenario") -> ScenarioPlan:
+    return ScenarioPlan(
+        scenario_number=number,
+        name=f"{name} {number}",
+        steps=[StepPlan(step_number=index, step_name=step) for index, step in enumerate(steps)],
+    )
+
+
+def feature(*scenarios: ScenarioPlan, name: str = "Customers") -> FeaturePlan:
+    return FeaturePlan(feature_number=1, feature_name=name, scenarios=list(scenarios))
+
+
+def decorators_of(module: ast.Module) -> dict[str, list[str]]:
+    return {
+        node.name: [decorator.func.id for decorator in node.decorator_list]
+        for node in module.body
+        if isinstance(node, ast.FunctionDef)
+    }
+
+
+def test_step_definitions_compile_with_quotes_in_names():
+    plan = feature(
+        scenario(1, 'a customer named "abc"', 'I send "abc"', "the path is C:\\tmp\\"),
+        name='Customers "VIP" """edge"""',
+    )
+
+    source = service.TestArtifactGenerator().render_step_definitions(plan)
+
+    module = ast.parse(compile(source, "steps.py", "exec", ast.PyCF_ONLY_AST))
+    assert ast.get_docstring(module) == 'Step definitions for feature: Customers "VIP" """edge""".'
+    docstrings = [
+        ast.get_docstring(node) for node in module.body if isinstance(node, ast.FunctionDef)
+    ]
+    assert docstrings == ['a customer named "abc"', 'I send "abc"', "the path is C:\\tmp\\"]
+    assert "pytest.skip" in source
+    assert "NotImplementedError" not in source
+
+
+def test_step_registered_under_every_keyword_it_is_used_with():
+    plan = feature(
+        scenario(1, "a customer exists", "I delete the customer", "the response is ok"),
+        scenario(2, "the response is ok", "a customer exists", "I list customers"),
+    )
+
+    module = ast.parse(service.TestArtifactGenerator().render_step_definitions(plan))
+
+    assert decorators_of(module) == {
+        "step_a_customer_exists": ["given", "when"],
+        "step_i_delete_the_customer": ["when"],
+        "step_the_response_is_ok": ["given", "then"],
+        "step_i_list_customers": ["then"],
+    }
+
+
+def test_colliding_function_names_are_suffixed():
+    plan = feature(scenario(1, "a customer", "a-customer", "A customer!"))
+
+    module = ast.parse(service.TestArtifactGenerator().render_step_definitions(plan))
+
+    assert list(decorators_of(module)) == [
+        "step_a_customer",
+        "step_a_customer_2",
+        "step_a_customer_3",
+    ]
+
+
+def test_unchanged_scenarios_reuse_rendered_fragments():
+    generator = service.TestArtifactGenerator()
+    plan = feature(scenario(1, "a", "b", "c"), scenario(2, "d", "e"))
+
+    first = generator.render_feature(plan)
+    second = generator.render_feature(plan)
+
+    assert first == second
+    assert (generator.cache_misses, generator.cache_hits) == (2, 2)
+
+
+def test_scenario_cache_is_bounded():
+    generator = service.TestArtifactGenerator(cache_size=2)
+
+    generator.render_feature(feature(*(scenario(number, "a", "b") for number in range(1, 6))))
+
+    assert len(generator._scenario_cache) == 2
+
+
+def test_write_only_rewrites_changed_files(tmp_path):
+    plan = feature(scenario(1, "a", "b"))
+    generator = service.TestArtifactGenerator()
+    assert len(generator.write(generator.generate([plan], tmp_path))) == 2
+    assert generator.write(generator.generate([plan], tmp_path)) == []
+
+
+def test_fresh_generator_compares_against_files_on_disk(tmp_path):
+    plan = feature(scenario(1, "a", "b"))
+    generator = service.TestArtifactGenerator()
+    generator.write(generator.generate([plan], tmp_path))
+
+    fresh = service.TestArtifactGenerator()
+    assert fresh.write(fresh.generate([plan], tmp_path)) == []
+
+    changed = feature(scenario(1, "a", "b"), scenario(2, "c", "d"))
+    fresh = service.TestArtifactGenerator()
+    written = fresh.write(fresh.generate([changed], tmp_path))
+    assert sorted(path.name for path in written) == [
+        "01_customers.feature",
+        "test_01_customers_steps.py",
+    ]
+
+    feature_file = tmp_path / "features" / "01_customers.feature"
+    feature_file.write_text("edited by hand", encoding="utf-8")
+    fresh = service.TestArtifactGenerator()
+    assert fresh.write(fresh.generate([changed], tmp_path)) == [feature_file]
+
+
+def test_step_patterns_escape_braces_and_map_outline_parameters():
+    plan = feature(
+        scenario(1, 'I POST {"cpf": 1}', "a customer with cpf <cpf>", "<Full Name> exists")
+    )
+
+    source = service.TestArtifactGenerator().render_step_definitions(plan)
+
+    assert "scenarios('../features/01_customers.feature')" in source
+    assert "parsers.parse('I POST {{\"cpf\": 1}}')" in source
+    assert "parsers.parse('a customer with cpf {cpf}')" in source
+    assert "parsers.parse('{full_name} exists')" in source
+
+
+def run_generated_suite(plan: FeaturePlan, root, **templates) -> subprocess.CompletedProcess:
+    generator = service.TestArtifactGenerator(templates=templates)
+    generator.write(generator.generate([plan], root))
+    (root / "pytest.ini").write_text("[pytest]\n", encoding="utf-8")
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-rs", "-p", "no:cacheprovider", "steps"],
+        cwd=root,
+        capture_output=True,
+        text=True,
+    )
+
+
+def bdd_plan() -> FeaturePlan:
+    outline = ScenarioPlan(
+        scenario_number=2,
+        name="Register by document",
+        outlines=[
+            ScenarioOutline(
+                headers=[ScenarioOutlineHeader(name="cpf")],
+                rows=[
+                    ScenarioOutlineRow(data={"cpf": "123.456.789-09"}),
+                    ScenarioOutlineRow(data={"cpf": "987.654.321-00"}),
+                ],
+            )
+        ],
+        steps=[
+            StepPlan(step_number=1, step_name="a customer with cpf <cpf>"),
+            StepPlan(step_number=2, step_name='I POST {"cpf": "<cpf>"}'),
+            StepPlan(step_number=3, step_name='the response is "created"'),
+        ],
+    )
+    return feature(scenario(1, "a customer exists", 'I send "abc"', "the response is ok"), outline)
+
+
+def test_generated_suite_is_collected_and_skipped_by_pytest_bdd(tmp_path):
+    pytest.importorskip("pytest_bdd")
+
+    result = run_generated_suite(bdd_plan(), tmp_path)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "3 skipped" in result.stdout
+    assert "Step not implemented: a customer exists" in result.stdout
+    assert "Step not implemented: a customer with cpf <cpf>" in result.stdout
+
+
+def test_every_generated_step_matches_under_pytest_bdd(tmp_path):
+    pytest.importorskip("pytest_bdd")
+    passing_step = service.DEFAULT_TEMPLATES["step_definition"].replace(
+        "    pytest.skip(${skip_reason})\n", "    pass\n"
+    )
+
+    result = run_generated_suite(bdd_plan(), tmp_path, step_definition=passing_step)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "3 passed" in result.stdout
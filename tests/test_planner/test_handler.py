@@ -0,0 +1,47 @@
+"""Tests for the test planner message handler."""
+
+import pytest
+
+from aegis_agents.shared.messaging.topics import Topics
+from aegis_agents.test_planner.handler import UNKNOWN_SPECIFICATION_ID, failure_reporter
+
+
+class FakePublisher:
+    def __init__(self) -> None:
+        self.published: list[tuple] = []
+
+    async def publish(self, destination, message, correlation_id=None) -> None:
+        self.published.append((destination, message, correlation_id))
+
+
+async def test_failure_event_is_published_for_valid_message():
+    publisher = FakePublisher()
+
+    await failure_reporter(publisher)(
+        {"specification_id": 42, "trace_id": "trace-1"}, "corr-1", TimeoutError("LLM timeout")
+    )
+
+    [(destination, event, correlation_id)] = publisher.published
+    assert destination == Topics.TEST_GENERATION_PLANNING_FAILED
+    assert correlation_id == "corr-1"
+    assert event == {
+        "trace_id": "trace-1",
+        "specification_id": 42,
+        "error_type": "TimeoutError",
+        "message": "LLM timeout",
+    }
+
+
+@pytest.mark.parametrize(
+    "message",
+    [{}, {"specification_id": None}, {"specification_id": "abc"}, ["not", "a", "dict"]],
+)
+async def test_failure_event_is_published_for_malformed_message(message):
+    publisher = FakePublisher()
+
+    await failure_reporter(publisher)(message, "corr-2", KeyError("specification_id"))
+
+    [(_, event, _)] = publisher.published
+    assert event["specification_id"] == UNKNOWN_SPECIFICATION_ID
+    assert event["trace_id"] == "corr-2"
+    assert event["error_type"] == "KeyError"